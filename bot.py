@@ -5,10 +5,16 @@ A Telegram bot that enables creation and joining of Web3 events on Solana blockc
 with Here Wallet integration for wallet linking and transaction signing.
 """
 import os
+import re
+import asyncio
 import logging
+from dataclasses import dataclass
+from typing import Optional
 from dotenv import load_dotenv
 from telegram import Update, BotCommand
+from telegram.error import NetworkError, RetryAfter, TelegramError, TimedOut
 from telegram.ext import (
+    AIORateLimiter,
     ApplicationBuilder,
     CommandHandler,
     CallbackQueryHandler,
@@ -16,10 +22,16 @@ from telegram.ext import (
     filters,
     ContextTypes,
 )
+from telegram.request import HTTPXRequest
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
 # Import handlers
 from handlers.start import start_command, about_command, start_callback, settings_command
-from handlers.approval import approval_callback
+from handlers.approval import approval_callback, APPROVAL_RE
 from handlers.wallet import (
     connect_wallet_command,
     wallet_info_command,
@@ -33,7 +45,10 @@ from handlers.event import (
     event_callback,
     handle_text_input,
 )
-from handlers.faucet import faucet_command
+from handlers.faucet import faucet_command, init_redis as init_faucet_redis
+from utils.join_requests import init_redis
+from utils.outbound import start_outbound_worker, stop_outbound_worker
+from utils.persist_queue import start_persist_writer, stop_persist_writer
 
 # Load environment variables from .env file
 load_dotenv()
@@ -45,78 +60,194 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Get bot token from environment variables
-BOT_TOKEN = os.getenv("TELEGRAM_BOT_API_KEY")
-if not BOT_TOKEN or BOT_TOKEN == "YOUR_TELEGRAM_BOT_API_KEY":
+
+@dataclass(frozen=True)
+class Config:
+    """Bot settings read from the environment once at startup."""
+    bot_token: str
+    # When webhook_url is unset the bot falls back to long polling.
+    # TLS is expected to be terminated by a reverse proxy in front of the bot.
+    webhook_url: Optional[str]
+    webhook_secret: Optional[str]
+    port: int
+    # Optional Redis URL for shared join request state and faucet limits; local state is used when unset
+    redis_url: Optional[str]
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        """Build the config from environment variables."""
+        return cls(
+            bot_token=os.getenv("TELEGRAM_BOT_API_KEY", ""),
+            webhook_url=os.getenv("WEBHOOK_URL"),
+            webhook_secret=os.getenv("WEBHOOK_SECRET"),
+            port=int(os.getenv("PORT", "8443")),
+            redis_url=os.getenv("REDIS_URL"),
+        )
+
+
+CONFIG = Config.from_env()
+if not CONFIG.bot_token or CONFIG.bot_token == "YOUR_TELEGRAM_BOT_API_KEY":
     logger.error("No valid TELEGRAM_BOT_API_KEY found in environment variables!")
     logger.info("Please set your Telegram Bot API key in the .env file")
     exit(1)
 
+# Callback data patterns, compiled once and shared with the handler registrations
+WALLET_RE = re.compile(r"^wallet_")
+EVENT_RE = re.compile(r"^event_")
+
+# The only update types any handler uses; Telegram doesn't deliver the rest at all
+ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
+
+# Bot command menu, registered once at startup
+BOT_COMMANDS = (
+    BotCommand("start", "Start the bot and get an introduction"),
+    BotCommand("connect", "Connect your Here Wallet"),
+    BotCommand("wallet", "View your wallet information"),
+    BotCommand("send_create", "Create a new Solana event"),
+    BotCommand("send_join", "Join an existing event"),
+    BotCommand("my_events", "View your created and joined events"),
+    BotCommand("faucet", "Get SOL tokens for testing on Devnet"),
+    BotCommand("settings", "Configure your app and wallet settings"),
+)
+
 
 async def error_handler(update_obj: object, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle errors caused by updates."""
     # Cast to Update if it's the right type
     update = update_obj if isinstance(update_obj, Update) else None
     
-    logger.error(f"Update {update} caused error {context.error}")
+    logger.error("Update %s caused error %s", update, context.error)
+    
+    # Replying would hit the same network trouble or flood limit, so stop here
+    if isinstance(context.error, (NetworkError, TimedOut, RetryAfter)):
+        return
+    
     if update and update.effective_message:
-        await update.effective_message.reply_text(
-            "⚠️ An error occurred while processing your request. Please try again later."
-        )
+        try:
+            await update.effective_message.reply_text(
+                "⚠️ An error occurred while processing your request. Please try again later."
+            )
+        except TelegramError as e:
+            logger.error("Could not send error message to user: %s", e)
+
+
+async def post_init(application) -> None:
+    """Register the bot command menu and start the background workers."""
+    start_outbound_worker(application.bot)
+    start_persist_writer()
+    try:
+        await application.bot.set_my_commands(BOT_COMMANDS)
+    except TelegramError as e:
+        logger.error("Could not set bot commands: %s", e)
+
+
+async def post_stop(application) -> None:
+    """Stop the background workers, flushing any pending state writes."""
+    await stop_outbound_worker()
+    await stop_persist_writer()
+
+
+async def close_redis(application) -> None:
+    """Close the Redis connection pool on shutdown."""
+    client = application.bot_data.get("redis")
+    if client is not None:
+        await client.aclose()
 
 
 def main() -> None:
     """Start the SolMeet bot."""
+    # Run on uvloop's faster event loop where it is available
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     # Create the Application instance
-    application = ApplicationBuilder().token(BOT_TOKEN).build()
-
-    # Set up commands
-    commands = [
-        BotCommand("start", "Start the bot and get an introduction"),
-        BotCommand("connect", "Connect your Here Wallet"),
-        BotCommand("wallet", "View your wallet information"),
-        BotCommand("send_create", "Create a new Solana event"),
-        BotCommand("send_join", "Join an existing event"),
-        BotCommand("my_events", "View your created and joined events"),
-        BotCommand("faucet", "Get SOL tokens for testing on Devnet"),
-        BotCommand("settings", "Configure your app and wallet settings"),
-    ]
-    
+    # A larger HTTP/2 connection pool lets bursts of API calls run in parallel;
+    # getUpdates gets its own client so long polls never hold a pooled connection
+    application = (
+        ApplicationBuilder()
+        .token(CONFIG.bot_token)
+        .request(HTTPXRequest(
+            connection_pool_size=64,
+            http_version="2",
+            read_timeout=20,
+            connect_timeout=10,
+        ))
+        .get_updates_request(HTTPXRequest(
+            http_version="2",
+            read_timeout=20,
+            connect_timeout=10,
+        ))
+        .concurrent_updates(256)
+        # Throttle outgoing calls below Telegram's flood limits (30 msg/s overall,
+        # 20 msg/min per group) with some headroom, and retry on RetryAfter
+        .rate_limiter(AIORateLimiter(
+            overall_max_rate=25,
+            overall_time_period=1,
+            group_max_rate=18,
+            group_time_period=60,
+            max_retries=3,
+        ))
+        .post_init(post_init)
+        .post_stop(post_stop)
+        .post_shutdown(close_redis)
+        .build()
+    )
+
+    # Use Redis for join request state and faucet limits when configured
+    if CONFIG.redis_url:
+        import redis.asyncio as redis
+
+        client = redis.from_url(CONFIG.redis_url, decode_responses=True)
+        application.bot_data["redis"] = client
+        init_redis(client)
+        init_faucet_redis(client)
+        logger.info("Using Redis for join request storage and faucet limits")
+
     # Register command handlers
-    application.add_handler(CommandHandler("start", start_command))
-    application.add_handler(CommandHandler("help", start_command))
-    application.add_handler(CommandHandler("about", about_command))
-    application.add_handler(CommandHandler("connect", connect_wallet_command))
-    application.add_handler(CommandHandler("wallet", wallet_info_command))
-    application.add_handler(CommandHandler("send_create", create_event_command))
-    application.add_handler(CommandHandler("send_join", join_event_command))
-    application.add_handler(CommandHandler("my_events", my_events_command))
-    application.add_handler(CommandHandler("faucet", faucet_command))
-    application.add_handler(CommandHandler("settings", settings_command))
+    application.add_handler(CommandHandler("start", start_command, block=False))
+    application.add_handler(CommandHandler("help", start_command, block=False))
+    application.add_handler(CommandHandler("about", about_command, block=False))
+    application.add_handler(CommandHandler("connect", connect_wallet_command, block=False))
+    application.add_handler(CommandHandler("wallet", wallet_info_command, block=False))
+    application.add_handler(CommandHandler("send_create", create_event_command, block=False))
+    application.add_handler(CommandHandler("send_join", join_event_command, block=False))
+    application.add_handler(CommandHandler("my_events", my_events_command, block=False))
+    application.add_handler(CommandHandler("faucet", faucet_command, block=False))
+    application.add_handler(CommandHandler("settings", settings_command, block=False))
 
     # Register callback query handlers
-    application.add_handler(CallbackQueryHandler(wallet_callback, pattern=r"^wallet_"))
-    application.add_handler(CallbackQueryHandler(event_callback, pattern=r"^event_"))
-    application.add_handler(CallbackQueryHandler(start_callback, pattern=r"^start$"))
-    application.add_handler(CallbackQueryHandler(about_command, pattern=r"^about$"))
-    application.add_handler(CallbackQueryHandler(settings_command, pattern=r"^app_"))
-    application.add_handler(CallbackQueryHandler(approval_callback, pattern=r"^(approve|decline|requests)_"))
+    application.add_handler(CallbackQueryHandler(wallet_callback, pattern=WALLET_RE, block=False))
+    application.add_handler(CallbackQueryHandler(event_callback, pattern=EVENT_RE, block=False))
+    application.add_handler(CallbackQueryHandler(start_callback, pattern=r"^start$", block=False))
+    application.add_handler(CallbackQueryHandler(about_command, pattern=r"^about$", block=False))
+    application.add_handler(CallbackQueryHandler(settings_command, pattern=r"^app_", block=False))
+    application.add_handler(CallbackQueryHandler(approval_callback, pattern=APPROVAL_RE, block=False))
 
     # Register message handlers for event flows
     application.add_handler(MessageHandler(
         filters.TEXT & ~filters.COMMAND & filters.ChatType.PRIVATE,
-        handle_text_input
+        handle_text_input,
+        block=False
     ))
 
     # Register error handler
     application.add_error_handler(error_handler)
 
-    # We'll configure the bot commands later in a post-start function
-    # This avoids the async issues with set_my_commands
-
     # Start the Bot
-    logger.info("Starting SolMeet Bot...")
-    application.run_polling()
+    if CONFIG.webhook_url:
+        logger.info("Starting SolMeet Bot with webhook on port %s...", CONFIG.port)
+        application.run_webhook(
+            listen="0.0.0.0",
+            port=CONFIG.port,
+            url_path=CONFIG.bot_token,
+            webhook_url=f"{CONFIG.webhook_url.rstrip('/')}/{CONFIG.bot_token}",
+            secret_token=CONFIG.webhook_secret,
+            allowed_updates=ALLOWED_UPDATES,
+        )
+    else:
+        # Fallback for environments without a public HTTPS endpoint
+        logger.info("Starting SolMeet Bot with long polling...")
+        application.run_polling(poll_interval=0, timeout=20, allowed_updates=ALLOWED_UPDATES)
 
 
 if __name__ == "__main__":
@@ -125,4 +256,4 @@ if __name__ == "__main__":
     except (KeyboardInterrupt, SystemExit):
         logger.info("Bot stopped gracefully!")
     except Exception as e:
-        logger.error(f"Error running bot: {e}")
+        logger.error("Error running bot: %s", e)
@@ -2,32 +2,188 @@
 Approval handlers for join requests in the SolMeet bot.
 """
 
+import functools
+import html
 import logging
-import os
+import re
+import time
 import asyncio
-from typing import Optional, Tuple, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Tuple, Dict, Any, List, Set
 from pathlib import Path
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import TelegramError
 from telegram.ext import ContextTypes
 
 from utils.join_requests import (
+    AddResult,
     add_join_request,
     approve_join_request,
     decline_join_request,
-    format_requests_list,
-    get_event_by_id,
-    get_event_organizer_id,
-    get_event_requests,
-    get_request_status,
     format_request_name,
+    register_callback_token,
+    resolve_callback_token,
 )
-from utils.participants import add_event_participant, count_event_participants
-from utils.solana import join_event_onchain, format_wallet_address
-from utils.qr import generate_join_qr
+from utils.event_cache import (
+    cached_event,
+    cached_event_requests,
+    cached_organizer_id,
+    cached_participant_count,
+    invalidate_event_requests,
+    invalidate_participant_count,
+    invalidate_user_events,
+    is_organizer,
+)
+from utils.outbound import SendSpec, enqueue_message
+from utils.participants import add_event_participant, get_event_notification_subscribers
+from utils.solana import format_wallet_address
+from utils.solana_pool import submit_join
+from utils.qr import get_join_qr_bytes
 
 logger = logging.getLogger(__name__)
 
+# Matches the action prefix of approval callback data: "a_<token>" to approve,
+# "d_<token>" to decline, "i_<token>" for request details and "r_<event>[_<page>]" to list requests
+APPROVAL_RE = re.compile(r"^[adir]_")
+
+# Parses and validates full approval callback data in one pass
+CALLBACK_DATA_RE = re.compile(r"^(?P<action>[adir])_(?P<key>[A-Za-z0-9_-]+)$")
+
+# Failures expected from Telegram calls, storage and on-chain lookups; anything else is
+# a bug and is left to propagate to the application's error handler
+EXPECTED_ERRORS = (TelegramError, OSError, asyncio.TimeoutError)
+
+# Callback ids and approve/decline taps handled within this many seconds are dropped,
+# so double-clicks don't re-run the on-chain and storage pipeline
+RECENT_CALLBACK_TTL = 30.0
+MAX_RECENT_CALLBACKS = 10_000
+
+# Structure: {callback key: expires_at}
+_recent_callbacks: Dict[Any, float] = {}
+
+# (event_id, wallet) pairs with an approve or decline currently being processed
+_approvals_in_flight: Set[Tuple[str, str]] = set()
+
+# Replies to a join attempt when the wallet already has a request for the event,
+# with whether the attempt counts as a success
+EXISTING_REQUEST_REPLIES = {
+    AddResult.APPROVED: ("✅ You've already been approved for event {event_id}!", True),
+    AddResult.PENDING: ("⌛ Your request to join event {event_id} is still pending approval.", True),
+    AddResult.DECLINED: ("❌ Your request to join event {event_id} was declined by the organizer.", False),
+}
+
+# Notification templates, filled in with str.format_map
+ORGANIZER_REQUEST_TMPL = "🔔 Join request: {display_name} → {event_name}"
+ORGANIZER_REQUEST_SUMMARY_TMPL = "{display_name} → {event_name}"
+REQUESTER_PENDING_TMPL = (
+    "🕒 <b>Join Request Sent</b>\n\n"
+    "Your request to join <b>{event_name}</b> has been sent to the organizer.\n"
+    "You'll be notified when they approve or decline your request."
+)
+ORGANIZER_APPROVED_TMPL = (
+    "✅ <b>Request Approved</b>\n\n"
+    "You approved {requester_name}'s request to join event {event_id}.\n\n"
+    "They are now participant #{participant_count}."
+)
+REQUESTER_APPROVED_TMPL = (
+    "🎉 <b>Join Request Approved</b>\n\n"
+    "Your request to join event <b>{event_id}</b> has been approved!\n\n"
+    "You are participant #{participant_count}"
+)
+SUBSCRIBER_NOTIFY_TMPL = (
+    "🔔 <b>Event Notification</b>\n\n"
+    "<b>{participant_name}</b> has joined your event!\n"
+    "<b>Event ID:</b> <code>{event_id}</code>\n"
+    "<b>Wallet:</b> <code>{wallet_short}</code>\n\n"
+    "Current participants: {participant_count}"
+)
+ONCHAIN_RESULT_TMPL = "{requester_name}'s place in event {event_id}: {blockchain_status}"
+ORGANIZER_DECLINED_TMPL = "❌ You declined {requester_name}'s request to join event {event_id}."
+REQUESTER_DECLINED_TMPL = "❌ Your request to join event {event_id} was declined by the organizer."
+
+# Telegram file IDs of uploaded join QR images, {event_id: file_id}, least recently used first;
+# later sends reference the upload instead of sending the image again
+_join_qr_file_ids: "OrderedDict[str, str]" = OrderedDict()
+MAX_JOIN_QR_FILE_IDS = 512
+
+# Static keyboard pieces, built once at import and shared across updates
+BACK_TO_MENU_BUTTON = InlineKeyboardButton("Back to Menu", callback_data="start")
+
+# Pending requests shown per page of the request list
+REQUESTS_PER_PAGE = 8
+
+# Rendered request-list keyboards, reused while an event's pending requests are unchanged.
+# Entries expire well before their callback tokens do.
+# Structure: {(event_id, ((wallet, name), ...), page, page_count): (keyboard, expires_at)}
+_REQUEST_KEYBOARDS: "OrderedDict[Tuple[Any, ...], Tuple[InlineKeyboardMarkup, float]]" = OrderedDict()
+MAX_REQUEST_KEYBOARDS = 256
+REQUEST_KEYBOARD_TTL = 60 * 60
+
+def _seen_recently(key: Any) -> bool:
+    """
+    Check whether a callback key was already handled recently, and remember it if not.
+    
+    Args:
+        key: The callback key (a callback query id or an (action, token) pair)
+        
+    Returns:
+        True if the key was handled within RECENT_CALLBACK_TTL, False otherwise
+    """
+    now = time.monotonic()
+    expires_at = _recent_callbacks.get(key)
+    if expires_at and expires_at > now:
+        return True
+        
+    if len(_recent_callbacks) >= MAX_RECENT_CALLBACKS:
+        for stale in [k for k, t in _recent_callbacks.items() if t <= now]:
+            del _recent_callbacks[stale]
+            
+    _recent_callbacks[key] = now + RECENT_CALLBACK_TTL
+    return False
+
+def _forget_recent(key: Any) -> None:
+    """Drop a callback key remembered by _seen_recently, so the same tap is handled again."""
+    _recent_callbacks.pop(key, None)
+
+async def _reply(update: Update, text: str, reply_markup: Optional[InlineKeyboardMarkup] = None) -> None:
+    """
+    Reply to the user through the callback query message or the incoming message.
+    
+    Args:
+        update: The update object
+        text: The text to send
+        reply_markup: Optional keyboard to attach
+    """
+    if update.callback_query:
+        await update.callback_query.edit_message_text(text, reply_markup=reply_markup)
+    elif update.message:
+        await update.message.reply_text(text, reply_markup=reply_markup)
+
+def _display_name(
+    username: Optional[str],
+    first_name: Optional[str],
+    last_name: Optional[str],
+    user_id: int
+) -> str:
+    """
+    Format a Telegram user's name for display.
+    
+    Args:
+        username: The user's username
+        first_name: The user's first name
+        last_name: The user's last name
+        user_id: The user's ID, used when no name is available
+        
+    Returns:
+        The display name
+    """
+    if username:
+        return f"@{username}"
+    if first_name:
+        return f"{first_name} {last_name}" if last_name else first_name
+    return f"User {user_id}"
+
 async def send_join_request(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
@@ -55,80 +211,57 @@ async def send_join_request(
         Success status
     """
     try:
-        # Check if the user has already sent a request for this event
-        request_status = get_request_status(event_id, user_wallet)
-        
-        if request_status == "approved":
-            if update.message:
-                await update.message.reply_text(
-                    f"✅ You've already been approved for event {event_id}!"
-                )
-            return True
-            
-        if request_status == "pending":
-            if update.message:
-                await update.message.reply_text(
-                    f"⌛ Your request to join event {event_id} is still pending approval."
-                )
-            return True
-            
-        if request_status == "declined":
-            if update.message:
-                await update.message.reply_text(
-                    f"❌ Your request to join event {event_id} was declined by the organizer."
-                )
-            return False
-        
-        # Add the join request
-        added = add_join_request(
-            event_id=event_id,
-            wallet_address=user_wallet,
-            user_id=user_id,
-            username=username,
-            first_name=first_name,
-            last_name=last_name
+        # Add the join request (an existing request is reported instead of replaced)
+        # while the organizer is looked up from the same cached event record that
+        # the organizer notification reads
+        result, organizer_id = await asyncio.gather(
+            add_join_request(
+                event_id=event_id,
+                wallet_address=user_wallet,
+                user_id=user_id,
+                username=username,
+                first_name=first_name,
+                last_name=last_name
+            ),
+            cached_organizer_id(event_id)
         )
         
-        if added:
-            # Get the event organizer's user ID
-            organizer_id = get_event_organizer_id(event_id)
+        if result in EXISTING_REQUEST_REPLIES:
+            text, success = EXISTING_REQUEST_REPLIES[result]
+            await _reply(update, text.format(event_id=event_id))
+            return success
+        
+        if result is AddResult.ADDED:
+            invalidate_event_requests(event_id)
             
             if organizer_id:
-                # Notify the organizer
-                await notify_organizer_of_request(
+                # Notify the organizer in the background so the requester isn't kept waiting
+                context.application.create_task(notify_organizer_of_request(
                     context=context,
                     event_id=event_id,
                     requester_wallet=user_wallet,
                     requester_id=user_id,
                     organizer_id=organizer_id,
-                    username=username,
-                    first_name=first_name,
-                    last_name=last_name
-                )
+                    display_name=_display_name(username, first_name, last_name, user_id)
+                ))
                 
                 return True
             else:
-                logger.error(f"Could not find organizer for event {event_id}")
-                if update.message:
-                    await update.message.reply_text(
-                        f"❌ Could not find the organizer for event {event_id}. Please try again later."
-                    )
+                logger.error("Could not find organizer for event %s", event_id)
+                await _reply(update, f"❌ Could not find the organizer for event {event_id}. Please try again later.")
                 return False
         else:
-            logger.error(f"Could not add join request for event {event_id}")
-            if update.message:
-                await update.message.reply_text(
-                    f"❌ There was an error sending your join request. Please try again later."
-                )
+            logger.error("Could not add join request for event %s", event_id)
+            await _reply(update, f"❌ There was an error sending your join request. Please try again later.")
             return False
             
-    except Exception as e:
-        logger.error(f"Error sending join request: {e}")
-        if update.message:
-            await update.message.reply_text(
-                f"❌ Error sending join request: {str(e)}"
-            )
+    except EXPECTED_ERRORS as e:
+        logger.error("Error sending join request: %s", e)
+        await _reply(update, f"❌ Error sending join request: {str(e)}")
         return False
+    except Exception:
+        logger.exception("Unexpected error sending join request for event %s", event_id)
+        raise
 
 async def notify_organizer_of_request(
     context: ContextTypes.DEFAULT_TYPE,
@@ -136,9 +269,7 @@ async def notify_organizer_of_request(
     requester_wallet: str,
     requester_id: int,
     organizer_id: int,
-    username: Optional[str] = None,
-    first_name: Optional[str] = None,
-    last_name: Optional[str] = None
+    display_name: str
 ) -> None:
     """
     Notify the event organizer of a new join request with improved one-click approval UI.
@@ -149,83 +280,211 @@ async def notify_organizer_of_request(
         requester_wallet: The requester's wallet address
         requester_id: The requester's user ID
         organizer_id: The organizer's user ID
-        username: The requester's username
-        first_name: The requester's first name
-        last_name: The requester's last name
+        display_name: The requester's display name
     """
 
     try:
-        # Format the user's name for display
-        if username:
-            display_name = f"@{username}"
-        elif first_name:
-            display_name = first_name
-            if last_name:
-                display_name += f" {last_name}"
-        else:
-            display_name = f"User {requester_id}"
-        
-        # Get event details from join requests system
-        
-        event = get_event_by_id(event_id)
+        # The event lookup and token registration are independent, so run them together
+        event, token = await asyncio.gather(
+            cached_event(event_id),
+            register_callback_token(event_id, requester_wallet)
+        )
         if not event:
-            logger.warning(f"Could not find event {event_id} details for notification")
-            event_name = "Unnamed Event"
-            event_date = "Date not set"
-            event_venue = "Venue not set"
-        else:
-            event_name = event.get("name", "Unnamed Event")
-            event_date = event.get("date", "Date not set")
-            event_venue = event.get("venue", "Venue not set")
+            logger.warning("Could not find event %s details for notification", event_id)
+        event_name = str(event.get("name", "Unnamed Event")) if event else "Unnamed Event"
         
-        # Get participant count information
-        participant_count = count_event_participants(event_id)
-        max_participants = event.get("max_participants", "∞") if event else "∞"
+        message_ctx = {"display_name": display_name, "event_name": event_name}
         
-        # Create an improved keyboard with approval/decline buttons
-        keyboard = InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("✅ Approve", callback_data=f"approve_{event_id}_{requester_wallet}"),
-                InlineKeyboardButton("❌ Decline", callback_data=f"decline_{event_id}_{requester_wallet}")
-            ],
-            [
-                InlineKeyboardButton("👥 View All Requests", callback_data=f"requests_{event_id}")
-            ]
-        ])
-        
-        # Format wallet address for display
-        from utils.solana import format_wallet_address
-        short_wallet = format_wallet_address(requester_wallet)
+        # Keep the notification to one plain-text line; the full request is
+        # fetched only if the organizer taps Details
+        enqueue_message(SendSpec(
+            chat_id=organizer_id,
+            text=ORGANIZER_REQUEST_TMPL.format_map(message_ctx),
+            reply_markup=_request_keyboard(event_id, token, details=True),
+            parse_mode=None,
+            summary=ORGANIZER_REQUEST_SUMMARY_TMPL.format_map(message_ctx),
+            summary_button=InlineKeyboardButton(f"👥 Requests for {event_id}", callback_data=f"r_{event_id}"),
+            summary_header="🔔 {count} New Join Requests"
+        ))
         
-        # Send the enhanced notification to the organizer
+        # Also notify the requester that their request is pending
         await context.bot.send_message(
-            chat_id=organizer_id,
-            text=(
-                f"🔔 *New Join Request*\n\n"
-                f"*{display_name}* wants to join your event:\n"
-                f"*{event_name}*\n\n"
-                f"📅 {event_date}\n"
-                f"📍 {event_venue}\n"
-                f"👥 Participants: {participant_count}/{max_participants}\n\n"
-                f"Wallet: `{short_wallet}`\n\n"
-                f"Would you like to approve this request?"
-            ),
-            parse_mode="Markdown",
-            reply_markup=keyboard
+            chat_id=requester_id,
+            text=REQUESTER_PENDING_TMPL.format_map({"event_name": html.escape(event_name)}),
+            parse_mode="HTML"
         )
+    except EXPECTED_ERRORS as e:
+        logger.error("Error notifying organizer of request: %s", e)
+    except Exception:
+        logger.exception("Unexpected error notifying organizer of event %s", event_id)
+        raise
+
+async def _gather_logged(*coros) -> None:
+    """
+    Run independent Telegram calls concurrently and log any that failed.
+    
+    Args:
+        *coros: The coroutines to run
+    """
+    results = await asyncio.gather(*coros, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error("Concurrent Telegram call failed: %s", result)
+
+async def _send_event_qr(context: ContextTypes.DEFAULT_TYPE, requester_id: int, event_id: str) -> None:
+    """
+    Generate the event's join QR code and send it to a requester.
+    
+    Args:
+        context: The context object
+        requester_id: The requester's user ID
+        event_id: The event ID
+    """
+    photo = _join_qr_file_ids.get(event_id)
+    if photo is not None:
+        _join_qr_file_ids.move_to_end(event_id)
+    else:
+        photo = await asyncio.to_thread(get_join_qr_bytes, event_id)
+        if not photo:
+            return
         
-        # Also notify the requester that their request is pending
+    message = await context.bot.send_photo(
+        chat_id=requester_id,
+        photo=photo,
+        caption=f"Here's your QR code for event {event_id}. Share this with others!"
+    )
+    
+    if message.photo:
+        _join_qr_file_ids[event_id] = message.photo[-1].file_id
+        if len(_join_qr_file_ids) > MAX_JOIN_QR_FILE_IDS:
+            _join_qr_file_ids.popitem(last=False)
+
+async def notify_requester_of_approval(
+    context: ContextTypes.DEFAULT_TYPE,
+    requester_id: int,
+    event_id: str,
+    text: str
+) -> None:
+    """
+    Notify a requester that their join request was approved and send the event QR code.
+    
+    Args:
+        context: The context object
+        requester_id: The requester's user ID
+        event_id: The event ID
+        text: The approval message text (HTML)
+    """
+    # The message goes out while the QR code is still being generated
+    await _gather_logged(
+        context.bot.send_message(
+            chat_id=requester_id,
+            text=text,
+            parse_mode="HTML",
+            disable_web_page_preview=True
+        ),
+        _send_event_qr(context, requester_id, event_id)
+    )
+
+async def notify_requester_of_decline(
+    context: ContextTypes.DEFAULT_TYPE,
+    requester_id: int,
+    event_id: str
+) -> None:
+    """
+    Notify a requester that their join request was declined.
+    
+    Args:
+        context: The context object
+        requester_id: The requester's user ID
+        event_id: The event ID
+    """
+    try:
         await context.bot.send_message(
             chat_id=requester_id,
-            text=(
-                f"🕒 *Join Request Sent*\n\n"
-                f"Your request to join *{event_name}* has been sent to the organizer.\n"
-                f"You'll be notified when they approve or decline your request."
-            ),
-            parse_mode="Markdown"
+            text=REQUESTER_DECLINED_TMPL.format_map({"event_id": event_id})
         )
     except Exception as e:
-        logger.error(f"Error notifying organizer of request: {e}")
+        logger.error("Error notifying requester %s of decline: %s", requester_id, e)
+
+async def notify_event_subscribers(
+    context: ContextTypes.DEFAULT_TYPE,
+    event_id: str,
+    joiner_id: Optional[int],
+    joiner_wallet: str,
+    username: Optional[str] = None,
+    first_name: Optional[str] = None,
+    last_name: Optional[str] = None,
+    participant_count: Optional[int] = None,
+    approver_id: Optional[int] = None
+) -> None:
+    """
+    Notify all subscribers of an event that a new participant has joined.
+    
+    Callers that just added the participant should pass the count returned by
+    add_event_participant, so the participants aren't counted again.
+    
+    Args:
+        context: The context object
+        event_id: The event ID
+        joiner_id: The new participant's user ID, who is not notified
+        joiner_wallet: The new participant's wallet address
+        username: The new participant's Telegram username (optional)
+        first_name: The new participant's first name (optional)
+        last_name: The new participant's last name (optional)
+        participant_count: The number of participants after the join (optional)
+        approver_id: The organizer who approved the join, who is told separately (optional)
+    """
+    # Format the participant's name
+    if username:
+        participant_name = f"@{username}"
+    elif first_name:
+        participant_name = f"{first_name}"
+        if last_name:
+            participant_name += f" {last_name}"
+    else:
+        participant_name = "a new participant"
+    
+    # Get all subscribers to notify, except the person who just joined and the approver;
+    # the set is a copy, so discarding from it leaves the stored subscribers alone
+    subscribers = get_event_notification_subscribers(event_id)
+    subscribers.discard(joiner_id)
+    subscribers.discard(approver_id)
+    
+    if not subscribers:
+        logger.info("No subscribers to notify for event %s", event_id)
+        return
+    
+    if participant_count is None:
+        # Read through the event cache, which loads the participants file off the event loop
+        participant_count = await cached_participant_count(event_id)
+    
+    # Formatted once and shared by every subscriber's message; HTML rather than
+    # Markdown, so any name escapes cleanly with html.escape
+    notification_text = SUBSCRIBER_NOTIFY_TMPL.format_map({
+        "participant_name": html.escape(participant_name),
+        "event_id": html.escape(event_id),
+        "wallet_short": format_wallet_address(joiner_wallet),
+        "participant_count": participant_count,
+    })
+    
+    # Send to all subscribers at once; flood limits are enforced by the bot's rate limiter
+    subscribers = list(subscribers)
+    results = await asyncio.gather(
+        *(
+            context.bot.send_message(
+                chat_id=subscriber_id,
+                text=notification_text,
+                parse_mode="HTML"
+            )
+            for subscriber_id in subscribers
+        ),
+        return_exceptions=True
+    )
+    for subscriber_id, result in zip(subscribers, results):
+        if isinstance(result, Exception):
+            logger.error("Error sending notification to %s: %s", subscriber_id, result)
+        else:
+            logger.info("Sent event notification to user %s", subscriber_id)
 
 async def approval_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
@@ -250,278 +509,522 @@ async def approval_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
         
     # Extract the action and parameters
-    parts = callback_data.split('_')
-    action = parts[0]
+    match = CALLBACK_DATA_RE.match(callback_data)
+    if match:
+        action, key = match.group("action", "key")
+        
+        # Drop redelivered callbacks and rapid repeat taps on the same approve/decline button
+        if _seen_recently(query.id) or (action in "ad" and _seen_recently((action, key))):
+            logger.info("Ignoring duplicate approval callback: %s", callback_data)
+            return
     
-    # Pass context explicitly to handle_approval
-    if action == "approve" and len(parts) >= 3:
-        event_id = parts[1]
-        wallet_address = '_'.join(parts[2:])  # In case wallet contains underscores
-        await handle_approval(query, user_id, event_id, wallet_address, approved=True, context=context)
-    elif action == "decline" and len(parts) >= 3:
-        event_id = parts[1]
-        wallet_address = '_'.join(parts[2:])  # In case wallet contains underscores
-        await handle_approval(query, user_id, event_id, wallet_address, approved=False, context=context)
-    elif action == "requests" and len(parts) >= 2:
-        event_id = parts[1]
-        await handle_requests_list(query, user_id, event_id, context=context)
-    else:
-        logger.error(f"Unknown approval action: {action}")
+    # Dispatch to the action handler; each returns False if its parameters are invalid
+    handler = APPROVAL_ACTIONS.get(action) if match else None
+    try:
+        handled = bool(handler) and await handler(query, context, user_id, key)
+    except Exception:
+        # Unexpected errors go to the application's error handler; the tap stays retryable
+        _forget_recent((action, key))
+        raise
+    if not handled:
+        logger.error("Invalid or expired approval callback: %s", callback_data)
         try:
             await query.edit_message_text(
                 "❌ There was an error processing your request. Please try again."
             )
         except Exception as edit_err:
-            logger.error(f"Failed to edit message: {edit_err}")
+            logger.error("Failed to edit message: %s", edit_err)
             # Try answering callback query with error text
             await query.answer("Error processing request. Please try again.")
 
+async def _finalize_onchain_join(
+    query,
+    context: ContextTypes.DEFAULT_TYPE,
+    requester_id: Optional[int],
+    event_id: str,
+    wallet_address: str,
+    requester_name: str
+) -> None:
+    """
+    Record an approved join on-chain and tell the organizer and requester the outcome.
+    
+    The organizer's result is a reply to the approval message rather than an edit of it:
+    by the time the transaction lands, the organizer may have reused that message for
+    the request list or another approval.
+    
+    Args:
+        query: The callback query whose message shows the approval
+        context: The context object
+        requester_id: The requester's user ID, if known
+        event_id: The event ID
+        wallet_address: The requester's wallet address
+        requester_name: The requester's display name (HTML-escaped)
+    """
+    tx_signature = None
+    try:
+        tx_signature = await submit_join(wallet_address, event_id)
+        logger.info("On-chain join successful: %s", tx_signature)
+        invalidate_user_events(wallet_address)
+    except asyncio.TimeoutError:
+        logger.error("On-chain join timed out for %s on event %s", wallet_address, event_id)
+    except Exception as e:
+        logger.error("On-chain join failed: %s", e)
+        
+    blockchain_status = "Recorded on-chain ⛓️" if tx_signature else "Recorded locally only 📋"
+    coros = []
+    if query.message:
+        coros.append(query.message.reply_text(
+            ONCHAIN_RESULT_TMPL.format_map({
+                "requester_name": requester_name,
+                "event_id": html.escape(event_id),
+                "blockchain_status": blockchain_status,
+            }),
+            parse_mode="HTML",
+            do_quote=True
+        ))
+    if tx_signature and requester_id:
+        coros.append(context.bot.send_message(
+            chat_id=requester_id,
+            text=(
+                f"⛓️ Your place in event <b>{html.escape(event_id)}</b> is now recorded on the Solana blockchain.\n\n"
+                f'<a href="https://explorer.solana.com/tx/{html.escape(tx_signature)}?cluster=devnet">View Transaction on Explorer</a>'
+            ),
+            parse_mode="HTML",
+            disable_web_page_preview=True
+        ))
+    await _gather_logged(*coros)
+
 async def handle_approval(
     query,
+    context: ContextTypes.DEFAULT_TYPE,
     user_id: int,
     event_id: str,
     wallet_address: str,
-    approved: bool,
-    context: ContextTypes.DEFAULT_TYPE
-) -> None:
+    approved: bool
+) -> bool:
     """
     Handle the approval or decline of a join request.
     
     Args:
         query: The callback query
+        context: The context object passed from the callback handler
         user_id: The user ID of the organizer
         event_id: The event ID
         wallet_address: The wallet address of the requester
         approved: Whether the request was approved
-        context: The context object passed from the callback handler
+        
+    Returns:
+        False if the request could not be approved or declined, so the tap can be retried
     """
-    # Use the passed context instead of getting it from query
-    if not context:
-        logger.error("No context provided to handle_approval")
-        try:
-            await query.answer("An error occurred. Please try again.")
-            return
-        except Exception:
-            return
+    # Drop taps on a request that is still being approved or declined; the check and
+    # add happen without an await in between, so no lock is needed
+    in_flight_key = (event_id, wallet_address)
+    if in_flight_key in _approvals_in_flight:
+        logger.info("Request from %s for event %s is already being processed", wallet_address, event_id)
+        return True
+    _approvals_in_flight.add(in_flight_key)
+    
     try:
-        # Check if the user is the event organizer
-        organizer_id = get_event_organizer_id(event_id)
-        
-        if organizer_id != user_id:
+        # Check the user is the event organizer before loading any requests
+        if not await is_organizer(event_id, user_id):
             await query.edit_message_text(
                 "❌ You don't have permission to perform this action."
             )
-            return
+            return False
             
         # Get request info before processing
-        requests = get_event_requests(event_id)
+        requests = await cached_event_requests(event_id)
         request_info = requests.get(wallet_address)
         
         if not request_info:
             await query.edit_message_text(
                 f"❌ Could not find request for wallet {wallet_address} in event {event_id}."
             )
-            return
+            return False
             
-        requester_id = request_info.get("user_id")
+        requester_id = request_info.user_id
+        requester_name = format_request_name(request_info)
         
         if approved:
             # Approve the request
-            success = approve_join_request(event_id, wallet_address, user_id)
+            success = await approve_join_request(event_id, wallet_address, user_id)
             
             if success:
-                # Complete the join process
+                invalidate_event_requests(event_id)
                 
-                # First, tell the user we're processing
-                await query.answer("Processing on-chain transaction...")
-                await query.edit_message_text(
-                    f"⏳ Processing approval for {format_request_name(request_info)}...\n"
-                    f"Sending transaction to Solana blockchain...",
-                    parse_mode="Markdown"
-                )
-                
-                # Try to join the event on-chain with timeout handling
-                tx_signature = None
-                tx_success = False
-                try:
-                    # Call blockchain function with timeout
-                    tx_signature = await asyncio.wait_for(
-                        join_event_onchain(wallet_address, event_id),
-                        timeout=10.0  # 10-second timeout for blockchain operations
-                    )
-                    logger.info(f"On-chain join successful: {tx_signature}")
-                    tx_success = True
-                except asyncio.TimeoutError:
-                    logger.error(f"On-chain join timed out for {wallet_address} on event {event_id}")
-                except Exception as e:
-                    logger.error(f"On-chain join failed: {e}")
-                
-                # Add the user to the event participants regardless of blockchain status
-                requester_username = request_info.get("username")
-                requester_first_name = request_info.get("first_name")
-                requester_last_name = request_info.get("last_name")
-                
-                # Make sure requester_id is a valid integer
-                requester_id_int = int(requester_id) if requester_id is not None else None
-                
-                if requester_id_int is None:
-                    logger.error(f"Invalid requester ID for join request: {requester_id}")
-                    await query.edit_message_text(
-                        f"❌ Error processing approval: Invalid requester ID"
-                    )
-                    return
-                
-                add_success = add_event_participant(
-                    event_id, wallet_address, requester_id_int, 
-                    requester_username, requester_first_name, requester_last_name
+                # Add the user to the event participants right away; the on-chain
+                # record is submitted in the background and reported when it lands
+                # The add returns the new participant count, or None on failure
+                participant_count = add_event_participant(
+                    event_id, wallet_address, requester_id,
+                    request_info.username, request_info.first_name, request_info.last_name
                 )
                 
-                if add_success:
-                    # Get the current participant count
-                    participant_count = count_event_participants(event_id)
-                    
-                    # Tell the organizer the request was approved with blockchain status
-                    requester_name = format_request_name(request_info)
-                    blockchain_status = "and recorded on-chain ⛓️" if tx_success else "locally only 📋"
+                if participant_count is not None:
+                    invalidate_participant_count(event_id)
                     
-                    await query.edit_message_text(
-                        f"✅ *Request Approved*\n\n"
-                        f"You approved {requester_name}'s request to join event {event_id} {blockchain_status}.\n\n"
-                        f"They are now participant #{participant_count}.",
-                        parse_mode="Markdown",
-                        reply_markup=InlineKeyboardMarkup([
-                            [InlineKeyboardButton("View All Requests", callback_data=f"requests_{event_id}")]
-                        ])
+                    # Tell the organizer the request was approved; the templates are HTML,
+                    # so user-provided values are escaped
+                    message_ctx = {
+                        "requester_name": html.escape(requester_name),
+                        "event_id": html.escape(event_id),
+                        "participant_count": participant_count,
+                    }
+                    approved_text = ORGANIZER_APPROVED_TMPL.format_map(message_ctx)
+                    keyboard = _view_all_keyboard(event_id)
+                    confirm_coro = query.edit_message_text(
+                        f"{approved_text}\n\n⏳ Recording on Solana; the result follows as a reply.",
+                        parse_mode="HTML",
+                        reply_markup=keyboard
                     )
                     
+                    # Tell the event's other subscribers about the new participant,
+                    # reusing the count from the add
+                    coros = [confirm_coro, notify_event_subscribers(
+                        context, event_id, requester_id, wallet_address,
+                        request_info.username, request_info.first_name, request_info.last_name,
+                        participant_count=participant_count,
+                        approver_id=user_id
+                    )]
+                    
                     # Notify the requester that they've been approved
                     if requester_id:
-                        # Generate QR code for the event
-                        qr_image_path = generate_join_qr(event_id)
-                        
-                        # Send message to the requester
-                        # Format messages with blockchain status
-                        on_chain_status = "and recorded on the Solana blockchain ⛓️" if tx_success else "with a local record only 📋"
-                        explorer_link = f"\n\n[View Transaction on Explorer](https://explorer.solana.com/tx/{tx_signature}?cluster=devnet)" if tx_success else ""
+                        coros.append(notify_requester_of_approval(
+                            context=context,
+                            requester_id=requester_id,
+                            event_id=event_id,
+                            text=REQUESTER_APPROVED_TMPL.format_map(message_ctx)
+                        ))
+                    await _gather_logged(*coros)
                         
-                        await context.bot.send_message(
-                            chat_id=requester_id,
-                            text=(
-                                f"🎉 *Join Request Approved*\n\n"
-                                f"Your request to join event *{event_id}* has been approved {on_chain_status}!\n\n"
-                                f"You are participant #{participant_count}{explorer_link}"
-                            ),
-                            parse_mode="Markdown",
-                            disable_web_page_preview=True
-                        )
-                        
-                        # Send the event QR code if available
-                        if qr_image_path and os.path.exists(qr_image_path):
-                            with open(qr_image_path, 'rb') as photo:
-                                await context.bot.send_photo(
-                                    chat_id=requester_id,
-                                    photo=photo,
-                                    caption=f"Here's your QR code for event {event_id}. Share this with others!"
-                                )
+                    context.application.create_task(_finalize_onchain_join(
+                        query, context, requester_id, event_id, wallet_address,
+                        message_ctx["requester_name"]
+                    ))
+                    return True
                 else:
                     await query.edit_message_text(
-                        f"❌ There was an error adding {format_request_name(request_info)} to the event."
+                        f"❌ There was an error adding {requester_name} to the event."
                     )
             else:
                 await query.edit_message_text(
-                    f"❌ There was an error approving {format_request_name(request_info)}'s request."
+                    f"❌ There was an error approving {requester_name}'s request."
                 )
         else:
             # Decline the request
-            success = decline_join_request(event_id, wallet_address, user_id)
+            success = await decline_join_request(event_id, wallet_address, user_id)
             
             if success:
+                invalidate_event_requests(event_id)
+                
                 # Tell the organizer the request was declined
-                await query.edit_message_text(
-                    f"❌ You declined {format_request_name(request_info)}'s request to join event {event_id}.",
-                    reply_markup=InlineKeyboardMarkup([
-                        [InlineKeyboardButton("View All Requests", callback_data=f"requests_{event_id}")]
-                    ])
+                confirm_coro = query.edit_message_text(
+                    ORGANIZER_DECLINED_TMPL.format_map({"requester_name": requester_name, "event_id": event_id}),
+                    reply_markup=_view_all_keyboard(event_id)
                 )
                 
                 # Notify the requester that they've been declined
                 if requester_id:
-                    await context.bot.send_message(
-                        chat_id=requester_id,
-                        text=f"❌ Your request to join event {event_id} was declined by the organizer."
-                    )
+                    await _gather_logged(confirm_coro, notify_requester_of_decline(
+                        context=context,
+                        requester_id=requester_id,
+                        event_id=event_id
+                    ))
+                else:
+                    await confirm_coro
+                return True
             else:
                 await query.edit_message_text(
-                    f"❌ There was an error declining {format_request_name(request_info)}'s request."
+                    f"❌ There was an error declining {requester_name}'s request."
                 )
                 
-    except Exception as e:
-        logger.error(f"Error handling approval: {e}")
+    except EXPECTED_ERRORS as e:
+        logger.error("Error handling approval: %s", e)
         await query.edit_message_text(
             f"❌ An error occurred while processing the request: {str(e)}"
         )
+    except Exception:
+        logger.exception("Unexpected error handling approval for event %s", event_id)
+        raise
+    finally:
+        _approvals_in_flight.discard(in_flight_key)
+    return False
 
-async def handle_requests_list(
+@functools.lru_cache(maxsize=2048)
+def _view_all_keyboard(event_id: str) -> InlineKeyboardMarkup:
+    """
+    Build the keyboard linking back to an event's pending requests.
+    
+    Args:
+        event_id: The event ID
+        
+    Returns:
+        The keyboard
+    """
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("View All Requests", callback_data=f"r_{event_id}")]
+    ])
+
+@functools.lru_cache(maxsize=4096)
+def _request_keyboard(event_id: str, token: str, details: bool = False) -> InlineKeyboardMarkup:
+    """
+    Build the approve/decline keyboard for a single join request.
+    
+    Args:
+        event_id: The event ID
+        token: The callback token registered for the request
+        details: Whether to include a button showing the full request
+        
+    Returns:
+        The keyboard
+    """
+    bottom_row = [InlineKeyboardButton("👥 View All Requests", callback_data=f"r_{event_id}")]
+    if details:
+        bottom_row.insert(0, InlineKeyboardButton("ℹ️ Details", callback_data=f"i_{token}"))
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton("✅ Approve", callback_data=f"a_{token}"),
+            InlineKeyboardButton("❌ Decline", callback_data=f"d_{token}")
+        ],
+        bottom_row
+    ])
+
+async def handle_request_details(
     query,
+    context: ContextTypes.DEFAULT_TYPE,
     user_id: int,
     event_id: str,
-    context: ContextTypes.DEFAULT_TYPE
+    wallet_address: str,
+    token: str
 ) -> None:
     """
-    Handle showing the list of join requests for an event.
+    Show the full details of a join request to the event organizer.
     
     Args:
         query: The callback query
-        user_id: The user ID of the requester
-        event_id: The event ID
         context: The context object passed from the callback handler
+        user_id: The user ID of the organizer
+        event_id: The event ID
+        wallet_address: The requester's wallet address
+        token: The callback token registered for the request
     """
-    # Use the passed context instead of trying to get it from query
-    if not context:
-        logger.error("No context provided to handle_requests_list")
-        try:
-            await query.answer("An error occurred. Please try again.")
+    try:
+        # Check the user is the event organizer before loading any requests
+        if not await is_organizer(event_id, user_id):
+            await query.edit_message_text(
+                "❌ You don't have permission to view requests for this event."
+            )
             return
-        except Exception:
+            
+        requests, event = await asyncio.gather(
+            cached_event_requests(event_id),
+            cached_event(event_id)
+        )
+        request_info = requests.get(wallet_address)
+        
+        if not request_info:
+            await query.edit_message_text(
+                f"❌ Could not find request for wallet {wallet_address} in event {event_id}."
+            )
             return
-    try:
-        # Check if the user is the event organizer
-        organizer_id = get_event_organizer_id(event_id)
+            
+        event = event or {}
+        event_name = html.escape(str(event.get("name", "Unnamed Event")))
+        event_date = html.escape(str(event.get("date", "Date not set")))
+        event_venue = html.escape(str(event.get("venue", "Venue not set")))
+        # Only count participants when there is a cap to count them against
+        max_participants = event.get("max_claims")
+        if max_participants:
+            participant_count = await cached_participant_count(event_id)
+            participants_line = f"👥 Participants: {participant_count}/{max_participants}"
+        else:
+            participants_line = "👥 Participants: —/∞"
+        
+        await query.edit_message_text(
+            f"🔔 <b>Join Request</b>\n\n"
+            f"<b>{html.escape(format_request_name(request_info))}</b> wants to join your event:\n"
+            f"<b>{event_name}</b>\n\n"
+            f"📅 {event_date}\n"
+            f"📍 {event_venue}\n"
+            f"{participants_line}\n\n"
+            f"Wallet: <code>{format_wallet_address(wallet_address)}</code>\n"
+            f"Status: {request_info.status}",
+            parse_mode="HTML",
+            reply_markup=_request_keyboard(event_id, token) if request_info.status == "pending" else None
+        )
+    except EXPECTED_ERRORS as e:
+        logger.error("Error showing request details: %s", e)
+    except Exception:
+        logger.exception("Unexpected error showing request details for event %s", event_id)
+        raise
+
+async def _requests_keyboard(
+    event_id: str,
+    pending: List[Tuple[str, str]],
+    page: int = 0,
+    page_count: int = 1
+) -> InlineKeyboardMarkup:
+    """
+    Build (or reuse) the approve/decline keyboard for one page of an event's pending requests.
+    
+    Args:
+        event_id: The event ID
+        pending: (wallet, display name) pairs of the pending requests on this page
+        page: The page number, starting at 0
+        page_count: The total number of pages
         
-        if organizer_id != user_id:
+    Returns:
+        The keyboard, with page navigation and a back button at the bottom
+    """
+    key = (event_id, tuple(pending), page, page_count)
+    cached = _REQUEST_KEYBOARDS.get(key)
+    if cached and cached[1] > time.monotonic():
+        _REQUEST_KEYBOARDS.move_to_end(key)
+        return cached[0]
+        
+    # Create buttons for each request
+    tokens = await asyncio.gather(
+        *(register_callback_token(event_id, wallet) for wallet, _ in pending)
+    )
+    buttons = [
+        [
+            InlineKeyboardButton(f"✅ {name}", callback_data=f"a_{token}"),
+            InlineKeyboardButton(f"❌ {name}", callback_data=f"d_{token}")
+        ]
+        for (_, name), token in zip(pending, tokens)
+    ]
+    
+    navigation = []
+    if page > 0:
+        navigation.append(InlineKeyboardButton("⬅️ Previous", callback_data=f"r_{event_id}_{page - 1}"))
+    if page < page_count - 1:
+        navigation.append(InlineKeyboardButton("Next ➡️", callback_data=f"r_{event_id}_{page + 1}"))
+    if navigation:
+        buttons.append(navigation)
+        
+    buttons.append([BACK_TO_MENU_BUTTON])
+    keyboard = InlineKeyboardMarkup(buttons)
+    
+    _REQUEST_KEYBOARDS[key] = (keyboard, time.monotonic() + REQUEST_KEYBOARD_TTL)
+    _REQUEST_KEYBOARDS.move_to_end(key)
+    if len(_REQUEST_KEYBOARDS) > MAX_REQUEST_KEYBOARDS:
+        _REQUEST_KEYBOARDS.popitem(last=False)
+    return keyboard
+
+async def handle_requests_list(
+    query,
+    context: ContextTypes.DEFAULT_TYPE,
+    user_id: int,
+    event_id: str,
+    page: int = 0
+) -> None:
+    """
+    Handle showing the list of join requests for an event, REQUESTS_PER_PAGE at a time.
+    
+    Args:
+        query: The callback query
+        context: The context object passed from the callback handler
+        user_id: The user ID of the requester
+        event_id: The event ID
+        page: The page to show, starting at 0
+    """
+    try:
+        # Check the user is the event organizer before loading any requests
+        if not await is_organizer(event_id, user_id):
             await query.edit_message_text(
                 "❌ You don't have permission to view requests for this event."
             )
             return
             
-        # Format the list of requests
-        requests_text = format_requests_list(event_id)
+        # Get the requests once and reuse them for the text and the buttons
+        requests = await cached_event_requests(event_id)
+        
+        # Format each pending requester's name once for all the buttons
+        pending = [
+            (wallet, format_request_name(request_info))
+            for wallet, request_info in requests.items()
+            if request_info.status == "pending"
+        ]
         
-        # Get the requests
-        requests = get_event_requests(event_id)
+        page_count = max(1, -(-len(pending) // REQUESTS_PER_PAGE))
+        page = min(max(page, 0), page_count - 1)
+        page_items = pending[page * REQUESTS_PER_PAGE:(page + 1) * REQUESTS_PER_PAGE]
         
-        # Create buttons for each request
-        buttons = []
-        for wallet, request_info in requests.items():
-            if request_info.get("status") == "pending":
-                name = format_request_name(request_info)
-                buttons.append([
-                    InlineKeyboardButton(f"✅ {name}", callback_data=f"approve_{event_id}_{wallet}"),
-                    InlineKeyboardButton(f"❌ {name}", callback_data=f"decline_{event_id}_{wallet}")
-                ])
+        keyboard = await _requests_keyboard(event_id, page_items, page, page_count)
         
-        # Add a back button
-        buttons.append([InlineKeyboardButton("Back to Menu", callback_data="start")])
+        # Build the message in one pass from the same page of requests
+        # HTML, so requester names are shown as typed once escaped
+        title = f"👥 <b>Join Requests for Event {html.escape(event_id)}</b>"
+        if page_count > 1:
+            title += f" (page {page + 1}/{page_count})"
+        lines = [title, ""]
+        if page_items:
+            lines.extend(
+                f"• {html.escape(name)} ({html.escape(format_wallet_address(wallet))})"
+                for wallet, name in page_items
+            )
+        else:
+            lines.append("No pending join requests for this event.")
         
         # Show the requests
         await query.edit_message_text(
-            f"👥 *Join Requests for Event {event_id}*\n\n{requests_text}",
-            parse_mode="Markdown",
-            reply_markup=InlineKeyboardMarkup(buttons)
+            "\n".join(lines),
+            parse_mode="HTML",
+            reply_markup=keyboard
         )
             
-    except Exception as e:
-        logger.error(f"Error handling requests list: {e}")
+    except EXPECTED_ERRORS as e:
+        logger.error("Error handling requests list: %s", e)
         await query.edit_message_text(
             f"❌ An error occurred while retrieving requests: {str(e)}"
-        )
\ No newline at end of file
+        )
+    except Exception:
+        logger.exception("Unexpected error handling requests list for event %s", event_id)
+        raise
+
+async def _do_approve(query, context, user_id: int, token: str) -> bool:
+    """Approve the join request the callback token was registered for."""
+    target = await resolve_callback_token(token)
+    if not target:
+        return False
+    event_id, wallet_address = target
+    if not await handle_approval(query, context, user_id, event_id, wallet_address, approved=True):
+        # The organizer has been told what went wrong; let them tap again right away
+        _forget_recent(("a", token))
+    return True
+
+async def _do_decline(query, context, user_id: int, token: str) -> bool:
+    """Decline the join request the callback token was registered for."""
+    target = await resolve_callback_token(token)
+    if not target:
+        return False
+    event_id, wallet_address = target
+    if not await handle_approval(query, context, user_id, event_id, wallet_address, approved=False):
+        # The organizer has been told what went wrong; let them tap again right away
+        _forget_recent(("d", token))
+    return True
+
+async def _do_details(query, context, user_id: int, token: str) -> bool:
+    """Show the full join request the callback token was registered for."""
+    target = await resolve_callback_token(token)
+    if not target:
+        return False
+    event_id, wallet_address = target
+    await handle_request_details(query, context, user_id, event_id, wallet_address, token)
+    return True
+
+async def _do_list(query, context, user_id: int, key: str) -> bool:
+    """Show a page of the pending join requests for the event ("<event>" or "<event>_<page>")."""
+    event_id, _, page = key.partition("_")
+    if page and not page.isdigit():
+        return False
+    await handle_requests_list(query, context, user_id, event_id, int(page or 0))
+    return True
+
+# Approval callback actions, keyed by the prefix matched by APPROVAL_RE
+APPROVAL_ACTIONS = {
+    "a": _do_approve,
+    "d": _do_decline,
+    "i": _do_details,
+    "r": _do_list,
+}
@@ -3,26 +3,29 @@ Event creation and management handlers for the SolMeet bot.
 """
 
 import asyncio
+import base64
 import logging
 import json
-import uuid
-import os
+import re
+import secrets
 from datetime import datetime
 from typing import Optional
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton, InputFile
+from telegram.error import TelegramError
 from telegram.ext import ContextTypes, ConversationHandler
+from telegram.helpers import escape_markdown
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+from handlers.approval import send_join_request
 from utils.here_wallet import get_wallet_by_user_id
-from utils.solana import create_event_onchain, join_event_onchain, get_user_events
-from utils.qr import generate_event_qr, generate_join_qr
+from utils.solana import create_event_onchain, join_event_onchain
+from utils.event_cache import cached_user_events, invalidate_user_events
+from utils.qr import generate_event_qr_bytes, generate_join_qr
 from utils.keyboard import get_main_keyboard, get_cancel_keyboard
 from utils.participants import (
-    add_event_participant, get_event_participants, count_event_participants,
-    format_participants_list, subscribe_to_event_notifications,
-    get_event_notification_subscribers
+    get_event_participants, format_participants_list, register_event_creator
 )
 
 logger = logging.getLogger(__name__)
@@ -37,21 +40,99 @@ logger = logging.getLogger(__name__)
     EVENT_CONFIRMATION
 ) = range(6)
 
+# Event date input, "YYYY-MM-DD HH:MM"; checked before building the datetime
+DATE_INPUT_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2})")
+
+# Event IDs: 8 base32 characters, or 8 hex characters for events created before base32 IDs
+EVENT_ID_RE = re.compile(r"[A-Z0-9]{8}")
+
+# Event callback data, "event_<action>[_<sub_action>]"
+EVENT_CALLBACK_RE = re.compile(r"^event_(?P<action>[a-z]+)(?:_(?P<sub_action>\w+))?$")
+
+# Reply to the "info" callback
+INFO_TEXT = (
+    "*What is SolMeet?*\n\n"
+    "SolMeet is a platform for creating and joining Web3 events on Solana.\n\n"
+    "With SolMeet, you can:\n"
+    "• Create events that are recorded on the Solana blockchain\n"
+    "• Join events and get verified on-chain\n"
+    "• Track your participation in various events\n"
+    "• Share events via QR codes and links\n\n"
+    "To get started, connect a wallet with the button below."
+)
+
+# Static keyboards, built once and shared by every handler
+CONNECT_WALLET_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect")]
+])
+WALLET_REQUIRED_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect")],
+    [InlineKeyboardButton("Back to Menu", callback_data="start")]
+])
+BACK_TO_MENU_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Back to Menu", callback_data="start")]
+])
+MY_EVENTS_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("Create Event", callback_data="event_create"),
+        InlineKeyboardButton("Join Event", callback_data="event_join")
+    ],
+    [InlineKeyboardButton("Back to Menu", callback_data="start")]
+])
+CONFIRM_CREATE_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("Create Event", callback_data="event_confirm_create"),
+        InlineKeyboardButton("Cancel", callback_data="event_cancel")
+    ]
+])
+CANCEL_TO_MENU_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Cancel", callback_data="start")]
+])
+EVENT_CREATED_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("View My Events", callback_data="event_list_mine"),
+        InlineKeyboardButton("Create Another", callback_data="event_create")
+    ],
+    [InlineKeyboardButton("Back to Menu", callback_data="start")]
+])
+JOIN_RETRY_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Try Again", callback_data="event_join")],
+    [InlineKeyboardButton("Back to Menu", callback_data="start")]
+])
+
+
+
+def _new_event_id() -> str:
+    """Generate a short event ID: 8 base32 characters, 40 random bits."""
+    return base64.b32encode(secrets.token_bytes(5)).decode()
+
+
+async def _require_wallet(update: Update, user_id: int, prompt: str) -> Optional[str]:
+    """
+    Get a user's connected wallet, prompting them to connect one if there is none.
+    
+    Args:
+        update: The update to reply to
+        user_id: The user's Telegram ID
+        prompt: What to tell the user when no wallet is connected
+        
+    Returns:
+        The wallet address, or None if the user has no wallet
+    """
+    user_wallet = get_wallet_by_user_id(user_id)
+    if not user_wallet:
+        await update.message.reply_text(prompt, reply_markup=CONNECT_WALLET_KEYBOARD)
+    return user_wallet
 
 async def create_event_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Handler for /send_create command. Starts the event creation flow.
     """
     user_id = update.effective_user.id
-    user_wallet = get_wallet_by_user_id(user_id)
-    
+    user_wallet = await _require_wallet(
+        update, user_id, "You need to connect your wallet first before creating an event."
+    )
     if not user_wallet:
-        await update.message.reply_text(
-            "You need to connect your wallet first before creating an event.",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect")]
-            ])
-        )
         return ConversationHandler.END
     
     # Initialize event data in context
@@ -61,130 +142,201 @@ async def create_event_command(update: Update, context: ContextTypes.DEFAULT_TYP
         "current_step": "name",
     }
     
-    await update.message.reply_text(
+    prompt = await update.message.reply_text(
         "Let's create a new event on Solana! 🚀\n\n"
         "What name would you like to give your event?",
         reply_markup=get_cancel_keyboard()
     )
+    # Later steps edit this message rather than sending a new prompt each time
+    context.user_data["create_event"]["prompt_msg_id"] = prompt.message_id
     
     return EVENT_NAME
 
 
-async def handle_event_creation(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    """
-    Process the event creation flow based on the current step.
+async def _prompt(
+    update: Update,
+    event_data: dict,
+    text: str,
+    parse_mode: Optional[str] = None,
+    reply_markup: Optional[InlineKeyboardMarkup] = None
+) -> None:
     """
-    if "create_event" not in context.user_data:
-        await update.message.reply_text(
-            "Something went wrong. Please start again with /send_create.",
-            reply_markup=get_main_keyboard()
-        )
-        return ConversationHandler.END
+    Show the next event creation prompt by editing the previous one in place.
     
-    event_data = context.user_data["create_event"]
-    current_step = event_data.get("current_step", "name")
-    text = update.message.text
+    Falls back to a new message, which becomes the prompt to edit, when there is no
+    previous prompt or it can no longer be edited.
     
-    if current_step == "name":
-        event_data["name"] = text
-        event_data["current_step"] = "venue"
-        
-        await update.message.reply_text(
-            f"Great! Your event is named: *{text}*\n\n"
-            "Now, what's the venue or location for this event?",
-            parse_mode="Markdown",
-            reply_markup=get_cancel_keyboard()
-        )
-        return EVENT_VENUE
-        
-    elif current_step == "venue":
-        event_data["venue"] = text
-        event_data["current_step"] = "date"
-        
-        await update.message.reply_text(
-            f"Venue set to: *{text}*\n\n"
-            "When will this event take place? (format: YYYY-MM-DD HH:MM)",
-            parse_mode="Markdown",
-            reply_markup=get_cancel_keyboard()
-        )
-        return EVENT_DATE
-        
-    elif current_step == "date":
+    Args:
+        update: The update holding the user's answer
+        event_data: The event creation state
+        text: The prompt text
+        parse_mode: The parse mode of the text, if any
+        reply_markup: The keyboard to show under the prompt
+    """
+    prompt_msg_id = event_data.get("prompt_msg_id")
+    if prompt_msg_id is not None:
         try:
-            event_date = datetime.strptime(text, "%Y-%m-%d %H:%M")
-            event_data["date"] = event_date.isoformat()
-            event_data["current_step"] = "description"
-            
-            await update.message.reply_text(
-                f"Date set to: *{text}*\n\n"
-                "Now, please provide a brief description of your event:",
-                parse_mode="Markdown",
-                reply_markup=get_cancel_keyboard()
+            await update.get_bot().edit_message_text(
+                chat_id=update.effective_chat.id,
+                message_id=prompt_msg_id,
+                text=text,
+                parse_mode=parse_mode,
+                reply_markup=reply_markup
             )
-            return EVENT_DESCRIPTION
+            return
+        except TelegramError as e:
+            logger.warning(f"Could not edit event creation prompt: {e}")
             
-        except ValueError:
-            await update.message.reply_text(
-                "Invalid date format. Please use YYYY-MM-DD HH:MM (e.g., 2023-12-31 15:00)",
-                reply_markup=get_cancel_keyboard()
-            )
-            return EVENT_DATE
+    message = await update.message.reply_text(text, parse_mode=parse_mode, reply_markup=reply_markup)
+    event_data["prompt_msg_id"] = message.message_id
+
+
+async def _step_name(update: Update, event_data: dict, text: str) -> int:
+    """Store the event name and ask for the venue."""
+    # Free-text fields are stored raw and, escaped once here, for the Markdown messages
+    event_data["name"] = text
+    event_data["name_md"] = escape_markdown(text)
+    event_data["current_step"] = "venue"
+    
+    await _prompt(
+        update, event_data,
+        f"Great! Your event is named: *{event_data['name_md']}*\n\n"
+        "Now, what's the venue or location for this event?",
+        parse_mode="Markdown",
+        reply_markup=get_cancel_keyboard()
+    )
+    return EVENT_VENUE
+
+
+async def _step_venue(update: Update, event_data: dict, text: str) -> int:
+    """Store the event venue and ask for the date."""
+    event_data["venue"] = text
+    event_data["venue_md"] = escape_markdown(text)
+    event_data["current_step"] = "date"
+    
+    await _prompt(
+        update, event_data,
+        f"Venue set to: *{event_data['venue_md']}*\n\n"
+        "When will this event take place? (format: YYYY-MM-DD HH:MM)",
+        parse_mode="Markdown",
+        reply_markup=get_cancel_keyboard()
+    )
+    return EVENT_DATE
+
+
+async def _step_date(update: Update, event_data: dict, text: str) -> int:
+    """Validate and store the event date and ask for the description."""
+    # Reject malformed input with the regex instead of a strptime exception;
+    # datetime() still rejects out-of-range values such as month 13
+    match = DATE_INPUT_RE.fullmatch(text.strip())
+    try:
+        event_date = datetime(*map(int, match.groups())) if match else None
+    except ValueError:
+        event_date = None
         
-    elif current_step == "description":
-        event_data["description"] = text
-        event_data["current_step"] = "max_claims"
+    if event_date is None:
+        await _prompt(
+            update, event_data,
+            "Invalid date format. Please use YYYY-MM-DD HH:MM (e.g., 2023-12-31 15:00)",
+            reply_markup=get_cancel_keyboard()
+        )
+        return EVENT_DATE
         
-        await update.message.reply_text(
-            "Description saved!\n\n"
-            "How many attendees can claim this event? (Enter a number)",
+    event_data["date"] = event_date.isoformat()
+    event_data["current_step"] = "description"
+    
+    await _prompt(
+        update, event_data,
+        f"Date set to: *{text}*\n\n"
+        "Now, please provide a brief description of your event:",
+        parse_mode="Markdown",
+        reply_markup=get_cancel_keyboard()
+    )
+    return EVENT_DESCRIPTION
+
+
+async def _step_description(update: Update, event_data: dict, text: str) -> int:
+    """Store the event description and ask for the maximum number of claims."""
+    event_data["description"] = text
+    event_data["description_md"] = escape_markdown(text)
+    event_data["current_step"] = "max_claims"
+    
+    await _prompt(
+        update, event_data,
+        "Description saved!\n\n"
+        "How many attendees can claim this event? (Enter a number)",
+        reply_markup=get_cancel_keyboard()
+    )
+    return EVENT_MAX_CLAIMS
+
+
+async def _step_max_claims(update: Update, event_data: dict, text: str) -> int:
+    """Validate and store the maximum number of claims and ask for confirmation."""
+    # Check the digits up front instead of catching int()'s ValueError; ASCII only,
+    # since str.isdigit() also accepts characters such as "²" that int() rejects
+    digits = text.strip()
+    max_claims = int(digits) if digits.isascii() and digits.isdigit() else 0
+    if max_claims <= 0:
+        await _prompt(
+            update, event_data,
+            "Please enter a valid positive number for maximum claims.",
             reply_markup=get_cancel_keyboard()
         )
         return EVENT_MAX_CLAIMS
         
-    elif current_step == "max_claims":
-        try:
-            max_claims = int(text)
-            if max_claims <= 0:
-                raise ValueError("Must be positive")
-                
-            event_data["max_claims"] = max_claims
-            event_data["current_step"] = "confirmation"
-            event_data["event_id"] = str(uuid.uuid4())[:8].upper()
-            
-            # Show the summary and ask for confirmation
-            summary = (
-                "*Event Summary*\n\n"
-                f"*Name:* {event_data['name']}\n"
-                f"*Venue:* {event_data['venue']}\n"
-                f"*Date:* {text}\n"
-                f"*Max Claims:* {max_claims}\n"
-                f"*Description:* {event_data['description']}\n\n"
-                "Is this information correct? Creating this event will require "
-                "a transaction on Solana Devnet that you'll need to sign with your wallet."
-            )
-            
-            keyboard = InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton("Create Event", callback_data="event_confirm_create"),
-                    InlineKeyboardButton("Cancel", callback_data="event_cancel")
-                ]
-            ])
-            
-            await update.message.reply_text(
-                summary,
-                parse_mode="Markdown",
-                reply_markup=keyboard
-            )
-            return EVENT_CONFIRMATION
-            
-        except ValueError:
-            await update.message.reply_text(
-                "Please enter a valid positive number for maximum claims.",
-                reply_markup=get_cancel_keyboard()
-            )
-            return EVENT_MAX_CLAIMS
+    event_data["max_claims"] = max_claims
+    event_data["current_step"] = "confirmation"
+    event_data["event_id"] = _new_event_id()
+    
+    # Show the summary and ask for confirmation
+    summary = (
+        "*Event Summary*\n\n"
+        f"*Name:* {event_data['name_md']}\n"
+        f"*Venue:* {event_data['venue_md']}\n"
+        f"*Date:* {text}\n"
+        f"*Max Claims:* {max_claims}\n"
+        f"*Description:* {event_data['description_md']}\n\n"
+        "Is this information correct? Creating this event will require "
+        "a transaction on Solana Devnet that you'll need to sign with your wallet."
+    )
     
-    return ConversationHandler.END
+    await _prompt(
+        update, event_data,
+        summary,
+        parse_mode="Markdown",
+        reply_markup=CONFIRM_CREATE_KEYBOARD
+    )
+    # The summary stays in place; the confirm buttons take it from here
+    event_data.pop("prompt_msg_id", None)
+    return EVENT_CONFIRMATION
+
+
+# Event creation step handlers by the step they collect; each returns the next state
+CREATION_STEPS = {
+    "name": _step_name,
+    "venue": _step_venue,
+    "date": _step_date,
+    "description": _step_description,
+    "max_claims": _step_max_claims,
+}
+
+
+async def handle_event_creation(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    """
+    Process the event creation flow based on the current step.
+    """
+    if "create_event" not in context.user_data:
+        await update.message.reply_text(
+            "Something went wrong. Please start again with /send_create.",
+            reply_markup=get_main_keyboard()
+        )
+        return ConversationHandler.END
+    
+    event_data = context.user_data["create_event"]
+    step_handler = CREATION_STEPS.get(event_data.get("current_step", "name"))
+    if not step_handler:
+        return ConversationHandler.END
+    return await step_handler(update, event_data, update.message.text)
 
 
 async def handle_event_text_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -225,7 +377,7 @@ async def handle_my_events(query, user_id: int, user_wallet: str) -> None:
     """Handler for displaying user's events from a callback."""
     try:
         # Get the user's events
-        events = await get_user_events(user_wallet)
+        events = await cached_user_events(user_wallet)
         
         created_events = events.get("created", [])
         joined_events = events.get("joined", [])
@@ -234,64 +386,50 @@ async def handle_my_events(query, user_id: int, user_wallet: str) -> None:
             await query.edit_message_text(
                 "You haven't created or joined any events yet.\n\n"
                 "Use the buttons below to create a new event or join an existing one.",
-                reply_markup=InlineKeyboardMarkup([
-                    [
-                        InlineKeyboardButton("Create Event", callback_data="event_create"),
-                        InlineKeyboardButton("Join Event", callback_data="event_join")
-                    ],
-                    [InlineKeyboardButton("Back to Menu", callback_data="start")]
-                ])
+                reply_markup=MY_EVENTS_KEYBOARD
             )
             return
         
         # Format the events list
+        # Build the text from a list of parts, joined once at the end
+        parts = []
         if created_events:
-            created_events_text = "*Events You Created:*\n\n"
-            for i, event in enumerate(created_events):
-                claims_text = f"{event.get('claims_count', 0)}/{event.get('max_claims', 'unlimited')}"
-                created_events_text += (
-                    f"{i+1}. *{event.get('name', 'Unnamed Event')}*\n"
-                    f"   ID: `{event.get('id', 'unknown')}`\n"
-                    f"   Date: {event.get('date', 'Not specified')}\n"
-                    f"   Venue: {event.get('venue', 'Not specified')}\n"
-                    f"   Participants: {claims_text}\n\n"
-                )
+            parts.append("*Events You Created:*\n\n")
+            parts.extend(
+                f"{i}. *{escape_markdown(str(event.get('name', 'Unnamed Event')))}*\n"
+                f"   ID: `{event.get('id', 'unknown')}`\n"
+                f"   Date: {event.get('date', 'Not specified')}\n"
+                f"   Venue: {escape_markdown(str(event.get('venue', 'Not specified')))}\n"
+                f"   Participants: {event.get('claims_count', 0)}/{event.get('max_claims', 'unlimited')}\n\n"
+                for i, event in enumerate(created_events, 1)
+            )
         else:
-            created_events_text = "*Events You Created:* None\n\n"
+            parts.append("*Events You Created:* None\n\n")
             
         if joined_events:
-            joined_events_text = "*Events You Joined:*\n\n"
-            for i, event in enumerate(joined_events):
-                joined_events_text += (
-                    f"{i+1}. *{event.get('name', 'Unnamed Event')}*\n"
-                    f"   Creator: {event.get('creator', 'unknown')}\n"
-                    f"   Date: {event.get('date', 'Not specified')}\n"
-                    f"   Venue: {event.get('venue', 'Not specified')}\n\n"
-                )
+            parts.append("*Events You Joined:*\n\n")
+            parts.extend(
+                f"{i}. *{escape_markdown(str(event.get('name', 'Unnamed Event')))}*\n"
+                f"   Creator: {event.get('creator', 'unknown')}\n"
+                f"   Date: {event.get('date', 'Not specified')}\n"
+                f"   Venue: {escape_markdown(str(event.get('venue', 'Not specified')))}\n\n"
+                for i, event in enumerate(joined_events, 1)
+            )
         else:
-            joined_events_text = "*Events You Joined:* None\n\n"
+            parts.append("*Events You Joined:* None\n\n")
             
-        # Combine the texts
-        events_text = created_events_text + joined_events_text
+        events_text = "".join(parts)
         
         await query.edit_message_text(
             events_text,
             parse_mode="Markdown",
-            reply_markup=InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton("Create Event", callback_data="event_create"),
-                    InlineKeyboardButton("Join Event", callback_data="event_join")
-                ],
-                [InlineKeyboardButton("Back to Menu", callback_data="start")]
-            ])
+            reply_markup=MY_EVENTS_KEYBOARD
         )
     except Exception as e:
         logger.error(f"Error fetching events: {e}")
         await query.edit_message_text(
             "Error fetching your events. Please try again later.",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("Back to Menu", callback_data="start")]
-            ])
+            reply_markup=BACK_TO_MENU_KEYBOARD
         )
 
 
@@ -302,16 +440,12 @@ async def event_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     query = update.callback_query
     await query.answer()
     
-    if not query.data or "_" not in query.data:
-        logger.warning(f"Invalid callback data: {query.data}")
-        return ConversationHandler.END
-        
-    parts = query.data.split("_")
-    if len(parts) < 2:
+    match = EVENT_CALLBACK_RE.match(query.data or "")
+    if not match:
         logger.warning(f"Malformed callback data: {query.data}")
         return ConversationHandler.END
         
-    action = parts[1]
+    action, sub_action = match.group("action", "sub_action")
     
     # Security check - make sure the user has a wallet
     user_id = query.from_user.id
@@ -320,229 +454,232 @@ async def event_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if action in ["create", "join", "my"] and not user_wallet:
         await query.edit_message_text(
             "You need to connect a wallet first to use this feature.",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect")],
-                [InlineKeyboardButton("Back to Menu", callback_data="start")]
-            ])
+            reply_markup=WALLET_REQUIRED_KEYBOARD
         )
         return ConversationHandler.END
     
-    # Handle event creation
-    if action == "create":
-        # Prepare event creation flow
-        # Initialize event data structure
-        context.user_data["create_event"] = {
-            "event_id": str(uuid.uuid4())[:8].upper(),  # Short unique ID
-            "creator_wallet": user_wallet,
-            "step": "name",  # Start with event name
-        }
+    # Dispatch to the action handler; unknown actions end the conversation
+    handler = EVENT_ACTIONS.get(action)
+    if not handler:
+        return ConversationHandler.END
+    return await handler(query, context, user_id, user_wallet, sub_action)
+
+
+async def _do_create(query, context, user_id: int, user_wallet: str, sub_action: Optional[str]) -> int:
+    """Start the event creation flow from a callback."""
+    # Prepare event creation flow
+    # Initialize event data structure
+    context.user_data["create_event"] = {
+        "event_id": _new_event_id(),  # Short unique ID
+        "creator_wallet": user_wallet,
+        "step": "name",  # Start with event name
+        # Later steps edit this message rather than sending a new prompt each time
+        "prompt_msg_id": query.message.message_id,
+    }
+
+    await query.edit_message_text(
+        "*Create a New Event*\n\n"
+        "Let's set up your event on Solana.\n\n"
+        "First, what's the *name* of your event?",
+        parse_mode="Markdown",
+        reply_markup=CANCEL_TO_MENU_KEYBOARD
+    )
+    return 1  # State for handling the event name
+
+
+async def _do_join(query, context, user_id: int, user_wallet: str, sub_action: Optional[str]) -> int:
+    """Prompt for the code of the event to join."""
+    # Prompt for event code
+    context.user_data["join_event"] = {
+        "user_wallet": user_wallet,
+        "user_id": user_id
+    }
+
+    await query.edit_message_text(
+        "*Join an Event*\n\n"
+        "Please enter the event code you'd like to join.\n"
+        "This is an 8-character code like 'ABC123XY'.",
+        parse_mode="Markdown",
+        reply_markup=CANCEL_TO_MENU_KEYBOARD
+    )
+    return 2  # State for handling the event code
+
+
+async def _do_my(query, context, user_id: int, user_wallet: str, sub_action: Optional[str]) -> int:
+    """Show the user's events."""
+    await handle_my_events(query, user_id, user_wallet)
+    return ConversationHandler.END
+
+
+async def _do_info(query, context, user_id: int, user_wallet: str, sub_action: Optional[str]) -> int:
+    """Explain what SolMeet is."""
+    await query.edit_message_text(INFO_TEXT, parse_mode="Markdown", reply_markup=WALLET_REQUIRED_KEYBOARD)
+    return ConversationHandler.END
+
+
+async def _do_confirm(query, context, user_id: int, user_wallet: str, sub_action: Optional[str]) -> int:
+    """Dispatch a confirmation callback on its sub-action."""
+    handler = CONFIRM_ACTIONS.get(sub_action)
+    if not handler:
+        logger.warning(f"Malformed confirmation data: {query.data}")
+        return ConversationHandler.END
+    return await handler(query, context, user_id, user_wallet, sub_action)
+
+
+async def _do_confirm_create(query, context, user_id: int, user_wallet: str, sub_action: Optional[str]) -> int:
+    """Start creating the event collected by the creation flow and end the conversation."""
+    # Take the event data now so a second tap on Create can't start a duplicate
+    event_data = context.user_data.pop("create_event", None)
+    if event_data is None:
+        return ConversationHandler.END
         
-        await query.edit_message_text(
-            "*Create a New Event*\n\n"
-            "Let's set up your event on Solana.\n\n"
-            "First, what's the *name* of your event?",
-            parse_mode="Markdown",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("Cancel", callback_data="start")]
-            ])
-        )
-        return 1  # State for handling the event name
+    await query.edit_message_text(
+        "Creating your event on Solana... This might take a moment.",
+    )
     
-    # Handle event joining
-    elif action == "join":
-        # Prompt for event code
-        context.user_data["join_event"] = {
-            "user_wallet": user_wallet,
-            "user_id": user_id
-        }
-        
-        await query.edit_message_text(
-            "*Join an Event*\n\n"
-            "Please enter the event code you'd like to join.\n"
-            "This is a short alphanumeric code like 'ABC123'.",
-            parse_mode="Markdown",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("Cancel", callback_data="start")]
-            ])
+    # The on-chain transaction, QR code and photo upload finish in the background,
+    # so the handler returns right away and the "Creating..." message is updated when done
+    context.application.create_task(_finish_event_create(query, context, event_data))
+    return ConversationHandler.END
+
+
+async def _finish_event_create(query, context, event_data: dict) -> None:
+    """Create an event on-chain and locally, then report the result to the creator."""
+    # Bind the fields used throughout the create path once
+    event_id = event_data["event_id"]
+    event_name = event_data["name"]
+    creator_wallet = event_data["creator_wallet"]
+
+    # Create the event on-chain
+    try:
+        # Render the QR code in a worker thread while the blockchain transaction is in flight
+        qr_task = asyncio.ensure_future(asyncio.to_thread(
+            generate_event_qr_bytes, event_id, event_name
+        ))
+
+        # Register the creator as the first attendee and subscriber
+        user_id = query.from_user.id
+        creator_username = query.from_user.username
+        creator_first_name = query.from_user.first_name
+        creator_last_name = query.from_user.last_name
+
+        # Add the creator to participants and subscribe them to notifications in a
+        # single participants file write (doesn't need blockchain access)
+        register_event_creator(
+            event_id,
+            creator_wallet,
+            user_id,
+            creator_username,
+            creator_first_name,
+            creator_last_name
         )
-        return 2  # State for handling the event code
-    
-    # Handle My Events
-    elif action == "my":
-        await handle_my_events(query, user_id, user_wallet)
-        return ConversationHandler.END
-    
-    # Handle event info
-    elif action == "info":
+
+        # Attempt blockchain transaction with timeout handling
+        try:
+            # Set a timeout for the blockchain operation
+            tx_signature = await asyncio.wait_for(
+                create_event_onchain(
+                    creator_wallet,
+                    event_id,
+                    event_name,
+                    event_data["description"],
+                    event_data["venue"],
+                    event_data["date"],
+                    event_data["max_claims"],
+                    creator_id=user_id  # Pass the creator's Telegram user ID
+                ),
+                # Matches the 10-second timeout of each RPC request; the local event
+                # record is written before the transaction, so giving up here is safe
+                timeout=10.0
+            )
+        except (asyncio.TimeoutError, Exception) as tx_error:
+            # Generate a simulated transaction signature if blockchain interaction fails
+            logger.error(f"Blockchain transaction error: {tx_error}")
+            tx_signature = f"simulated_create_{event_id}"
+
+        # Returns None rather than raising if the QR code could not be generated
+        qr_bytes = await qr_task
+
+        # The creator's event list has changed
+        invalidate_user_events(creator_wallet)
+
+        success_text = (
+            "🎉 *Event Created Successfully!*\n\n"
+            f"*Event ID:* `{event_id}`\n"
+            f"*Name:* {event_data['name_md']}\n"
+            f"*Venue:* {event_data['venue_md']}\n"
+            f"*Participants:* 1/{event_data['max_claims']}\n\n"
+            "Share this Event ID with attendees or have them scan the QR code."
+        )
+
+        keyboard = EVENT_CREATED_KEYBOARD
+
         await query.edit_message_text(
-            "*What is SolMeet?*\n\n"
-            "SolMeet is a platform for creating and joining Web3 events on Solana.\n\n"
-            "With SolMeet, you can:\n"
-            "• Create events that are recorded on the Solana blockchain\n"
-            "• Join events and get verified on-chain\n"
-            "• Track your participation in various events\n"
-            "• Share events via QR codes and links\n\n"
-            "To get started, connect a wallet with the button below.",
+            success_text,
             parse_mode="Markdown",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect")],
-                [InlineKeyboardButton("Back to Menu", callback_data="start")]
-            ])
+            reply_markup=keyboard,
+            disable_web_page_preview=False
         )
-        return ConversationHandler.END
-    
-    # Handle event confirmation
-    elif action == "confirm":
-        if len(parts) < 3:
-            logger.warning(f"Malformed confirmation data: {query.data}")
-            return ConversationHandler.END
-            
-        sub_action = parts[2]
-        
-        if sub_action == "create" and "create_event" in context.user_data:
-            event_data = context.user_data["create_event"]
-            
-            # Create the event on-chain
-            try:
-                await query.edit_message_text(
-                    "Creating your event on Solana... This might take a moment.",
-                )
-                
-                # Generate QR code for the event first (doesn't need blockchain access)
-                qr_image_path = generate_event_qr(event_data["event_id"], event_data["name"])
-                
-                # Register the creator as the first attendee and subscriber
-                user_id = query.from_user.id
-                creator_username = query.from_user.username
-                creator_first_name = query.from_user.first_name
-                creator_last_name = query.from_user.last_name
-                
-                # Add the creator to participants (doesn't need blockchain access)
-                add_event_participant(
-                    event_data["event_id"],
-                    event_data["creator_wallet"],
-                    user_id,
-                    creator_username,
-                    creator_first_name,
-                    creator_last_name
-                )
-                
-                # Subscribe the creator to notifications (doesn't need blockchain access)
-                subscribe_to_event_notifications(
-                    event_data["event_id"],
-                    user_id
-                )
-                
-                # Attempt blockchain transaction with timeout handling
-                try:
-                    # Set a timeout for the blockchain operation
-                    tx_signature = await asyncio.wait_for(
-                        create_event_onchain(
-                            event_data["creator_wallet"],
-                            event_data["event_id"],
-                            event_data["name"],
-                            event_data["description"],
-                            event_data["venue"],
-                            event_data["date"],
-                            event_data["max_claims"],
-                            creator_id=user_id  # Pass the creator's Telegram user ID
-                        ),
-                        timeout=5.0  # 5-second timeout
-                    )
-                except (asyncio.TimeoutError, Exception) as tx_error:
-                    # Generate a simulated transaction signature if blockchain interaction fails
-                    logger.error(f"Blockchain transaction error: {tx_error}")
-                    tx_signature = f"simulated_create_{event_data['event_id']}"
-                
-                success_text = (
-                    "🎉 *Event Created Successfully!*\n\n"
-                    f"*Event ID:* `{event_data['event_id']}`\n"
-                    f"*Name:* {event_data['name']}\n"
-                    f"*Venue:* {event_data['venue']}\n"
-                    f"*Participants:* 1/{event_data['max_claims']}\n\n"
-                    "Share this Event ID with attendees or have them scan the QR code."
-                )
-                
-                keyboard = InlineKeyboardMarkup([
-                    [
-                        InlineKeyboardButton("View My Events", callback_data="event_list_mine"),
-                        InlineKeyboardButton("Create Another", callback_data="event_create")
-                    ],
-                    [InlineKeyboardButton("Back to Menu", callback_data="start")]
-                ])
-                
-                # Clear the event creation data
-                del context.user_data["create_event"]
-                
-                await query.edit_message_text(
-                    success_text,
-                    parse_mode="Markdown",
-                    reply_markup=keyboard,
-                    disable_web_page_preview=False
-                )
-                
-                # Send the QR code as a separate message with image
-                if qr_image_path and os.path.exists(qr_image_path):
-                    # Send message about QR code
-                    await context.bot.send_message(
-                        chat_id=query.message.chat_id,
-                        text=f"Here's the QR code for your event *{event_data['name']}*. "
-                             f"Attendees can scan this to join your event with the code: *{event_data['event_id']}*",
-                        parse_mode="Markdown"
-                    )
-                    
-                    # Send the QR code image
-                    with open(qr_image_path, 'rb') as photo:
-                        await context.bot.send_photo(
-                            chat_id=query.message.chat_id,
-                            photo=photo,
-                            caption=f"QR Code for event: {event_data['name']} ({event_data['event_id']})"
-                        )
-                else:
-                    # Fallback if image generation failed
-                    await context.bot.send_message(
-                        chat_id=query.message.chat_id,
-                        text=f"Event created successfully. Share this code with attendees: *{event_data['event_id']}*",
-                        parse_mode="Markdown"
-                    )
-                
-                return ConversationHandler.END
-                
-            except Exception as e:
-                logger.error(f"Error creating event: {e}")
-                await query.edit_message_text(
-                    "There was an error creating your event on Solana. Please try again later.",
-                    reply_markup=get_main_keyboard()
-                )
-                return ConversationHandler.END
-    
-    elif action == "cancel":
-        if "create_event" in context.user_data:
-            del context.user_data["create_event"]
-        
+
+        # Send the QR code image straight from memory, with its explanation as the caption
+        if qr_bytes:
+            await context.bot.send_photo(
+                chat_id=query.message.chat_id,
+                photo=InputFile(qr_bytes, filename=f"{event_id}.png"),
+                caption=f"Here's the QR code for your event *{event_data['name_md']}*. "
+                        f"Attendees can scan this to join your event with the code: *{event_id}*",
+                parse_mode="Markdown"
+            )
+        else:
+            # Fallback if image generation failed
+            await context.bot.send_message(
+                chat_id=query.message.chat_id,
+                text=f"Event created successfully. Share this code with attendees: *{event_id}*",
+                parse_mode="Markdown"
+            )
+
+    except Exception as e:
+        logger.error(f"Error creating event: {e}")
         await query.edit_message_text(
-            "Event creation cancelled. You can start again with /send_create when you're ready.",
+            "There was an error creating your event on Solana. Please try again later.",
             reply_markup=get_main_keyboard()
         )
-        return ConversationHandler.END
-    
+
+
+async def _do_cancel(query, context, user_id: int, user_wallet: str, sub_action: Optional[str]) -> int:
+    """Cancel the event creation flow."""
+    context.user_data.pop("create_event", None)
+
+    await query.edit_message_text(
+        "Event creation cancelled. You can start again with /send_create when you're ready.",
+        reply_markup=get_main_keyboard()
+    )
     return ConversationHandler.END
 
 
+# Callback handlers by action and confirm sub-action; each returns the next conversation state
+CONFIRM_ACTIONS = {
+    "create": _do_confirm_create,
+}
+EVENT_ACTIONS = {
+    "create": _do_create,
+    "join": _do_join,
+    "my": _do_my,
+    "info": _do_info,
+    "confirm": _do_confirm,
+    "cancel": _do_cancel,
+}
+
+
 async def join_event_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Handler for /send_join command. Allows users to join an existing event.
     """
     user_id = update.effective_user.id
-    user_wallet = get_wallet_by_user_id(user_id)
-    
+    user_wallet = await _require_wallet(
+        update, user_id, "You need to connect your wallet first before joining an event."
+    )
     if not user_wallet:
-        await update.message.reply_text(
-            "You need to connect your wallet first before joining an event.",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect")]
-            ])
-        )
         return
     
     # Check if event_id was provided as an argument
@@ -573,13 +710,20 @@ async def process_event_join(
     Process the joining of an event after receiving the event ID.
     Now uses the approval system instead of direct joining.
     """
-    try:
-        # Import here to avoid circular imports
-        from handlers.approval import send_join_request
+    message = update.message
+    if not EVENT_ID_RE.fullmatch(event_id):
+        if message:
+            await message.reply_text(
+                "That doesn't look like an Event ID. It should be an 8-character code (e.g., 'ABC123XY').",
+                reply_markup=JOIN_RETRY_KEYBOARD
+            )
+        return
         
+    processing_message = None
+    try:
         # Send a processing message
-        if update.message:
-            processing_message = await update.message.reply_text(
+        if message:
+            processing_message = await message.reply_text(
                 f"Processing your request to join event {event_id}..."
             )
         
@@ -602,91 +746,29 @@ async def process_event_join(
             )
             
             # Update the processing message if it exists
-            if update.message and 'processing_message' in locals():
+            if processing_message:
                 await processing_message.edit_text(
                     f"Your request to join event {event_id} has been sent to the organizer.\n\n"
                     "You will be notified when your request is approved or declined.",
-                    reply_markup=InlineKeyboardMarkup([
-                        [InlineKeyboardButton("Back to Menu", callback_data="start")]
-                    ])
+                    reply_markup=BACK_TO_MENU_KEYBOARD
                 )
         else:
             logger.error("No effective user in update for process_event_join")
-            if update.message:
-                await update.message.reply_text(
+            if message:
+                await message.reply_text(
                     "❌ There was an error processing your request. Please try again later.",
-                    reply_markup=InlineKeyboardMarkup([
-                        [InlineKeyboardButton("Try Again", callback_data="event_join")],
-                        [InlineKeyboardButton("Back to Menu", callback_data="start")]
-                    ])
+                    reply_markup=JOIN_RETRY_KEYBOARD
                 )
             
     except Exception as e:
         logger.error(f"Error processing join request: {e}")
-        if update.message:
-            await update.message.reply_text(
+        if message:
+            await message.reply_text(
                 f"Error processing join request: {str(e)}",
                 reply_markup=get_main_keyboard()
             )
 
 
-async def notify_event_subscribers(
-    context: ContextTypes.DEFAULT_TYPE,
-    event_id: str,
-    joiner_id: int,
-    joiner_wallet: str,
-    username: Optional[str] = None,
-    first_name: Optional[str] = None,
-    last_name: Optional[str] = None
-) -> None:
-    """
-    Notify all subscribers of an event that a new participant has joined.
-    """
-    # Format the participant's name
-    if username:
-        participant_name = f"@{username}"
-    elif first_name:
-        participant_name = f"{first_name}"
-        if last_name:
-            participant_name += f" {last_name}"
-    else:
-        participant_name = f"a new participant"
-    
-    # Get all subscribers to notify
-    subscribers = get_event_notification_subscribers(event_id)
-    
-    # Don't notify the person who just joined
-    if joiner_id in subscribers:
-        subscribers.remove(joiner_id)
-    
-    if not subscribers:
-        logger.info(f"No subscribers to notify for event {event_id}")
-        return
-    
-    # Short format of wallet address
-    wallet_short = joiner_wallet[:6] + "..." + joiner_wallet[-4:]
-    
-    # Send notification to all subscribers
-    notification_text = (
-        f"🔔 *Event Notification*\n\n"
-        f"*{participant_name}* has joined your event!\n"
-        f"*Event ID:* `{event_id}`\n"
-        f"*Wallet:* `{wallet_short}`\n\n"
-        f"Current participants: {count_event_participants(event_id)}"
-    )
-    
-    for subscriber_id in subscribers:
-        try:
-            await context.bot.send_message(
-                chat_id=subscriber_id,
-                text=notification_text,
-                parse_mode="Markdown"
-            )
-            logger.info(f"Sent event notification to user {subscriber_id}")
-        except Exception as e:
-            logger.error(f"Error sending notification to {subscriber_id}: {e}")
-
-
 async def handle_event_join_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Handle text input for joining an event.
@@ -697,26 +779,19 @@ async def handle_event_join_text(update: Update, context: ContextTypes.DEFAULT_T
     if context.user_data["join_event"].get("waiting_for") != "event_id":
         return
     
-    user_id = update.effective_user.id
-    user_wallet = get_wallet_by_user_id(user_id)
+    # Clear the join event state up front so no path below can leave it behind
+    context.user_data.pop("join_event", None)
     
+    user_id = update.effective_user.id
+    user_wallet = await _require_wallet(
+        update, user_id, "You need to connect your wallet first before joining an event."
+    )
     if not user_wallet:
-        await update.message.reply_text(
-            "You need to connect your wallet first before joining an event.",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect")]
-            ])
-        )
-        # Clear the join event state
-        del context.user_data["join_event"]
         return
     
     # Get the event ID from the message
     event_id = update.message.text.strip().upper()
     
-    # Clear the join event state
-    del context.user_data["join_event"]
-    
     # Process joining the event
     await process_event_join(update, context, event_id, user_id, user_wallet)
 
@@ -726,20 +801,15 @@ async def my_events_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     Handler for /my_events command. Shows events created or joined by the user.
     """
     user_id = update.effective_user.id
-    user_wallet = get_wallet_by_user_id(user_id)
-    
+    user_wallet = await _require_wallet(
+        update, user_id, "You need to connect your wallet first to view your events."
+    )
     if not user_wallet:
-        await update.message.reply_text(
-            "You need to connect your wallet first to view your events.",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect")]
-            ])
-        )
         return
     
     try:
         # Get user's events from the blockchain
-        events = await get_user_events(user_wallet)
+        events = await cached_user_events(user_wallet)
         
         if not events or (len(events["created"]) == 0 and len(events["joined"]) == 0):
             await update.message.reply_text(
@@ -750,35 +820,31 @@ async def my_events_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
             return
         
         # Format the events
-        response = "*Your Events*\n\n"
+        parts = ["*Your Events*\n\n"]
         
-        if events["created"] and len(events["created"]) > 0:
-            response += "*Events You Created:*\n"
-            for event in events["created"]:
-                response += (
-                    f"• *{event['name']}*\n"
-                    f"  ID: `{event['id']}`\n"
-                    f"  Venue: {event['venue']}\n"
-                    f"  Claims: {event['claims_count']}/{event['max_claims']}\n\n"
-                )
+        if events["created"]:
+            parts.append("*Events You Created:*\n")
+            parts.extend(
+                f"• *{escape_markdown(event['name'])}*\n"
+                f"  ID: `{event['id']}`\n"
+                f"  Venue: {escape_markdown(event['venue'])}\n"
+                f"  Claims: {event['claims_count']}/{event['max_claims']}\n\n"
+                for event in events["created"]
+            )
         
-        if events["joined"] and len(events["joined"]) > 0:
-            response += "*Events You Joined:*\n"
-            for event in events["joined"]:
-                response += (
-                    f"• *{event['name']}*\n"
-                    f"  ID: `{event['id']}`\n"
-                    f"  Venue: {event['venue']}\n"
-                    f"  Date: {event['date']}\n\n"
-                )
+        if events["joined"]:
+            parts.append("*Events You Joined:*\n")
+            parts.extend(
+                f"• *{escape_markdown(event['name'])}*\n"
+                f"  ID: `{event['id']}`\n"
+                f"  Venue: {escape_markdown(event['venue'])}\n"
+                f"  Date: {event['date']}\n\n"
+                for event in events["joined"]
+            )
+        
+        response = "".join(parts)
         
-        keyboard = InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("Create Event", callback_data="event_create"),
-                InlineKeyboardButton("Join Event", callback_data="event_join")
-            ],
-            [InlineKeyboardButton("Back to Menu", callback_data="start")]
-        ])
+        keyboard = MY_EVENTS_KEYBOARD
         
         await update.message.reply_text(
             response,
@@ -4,6 +4,9 @@ Faucet handler for requesting Devnet SOL tokens.
 
 import logging
 import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes
 
@@ -13,8 +16,86 @@ from utils.keyboard import get_main_keyboard
 
 logger = logging.getLogger(__name__)
 
-# Store faucet request times to limit requests
-faucet_requests = {}
+# Static keyboards, built once and shared by every request
+CONNECT_WALLET_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect")]
+])
+AIRDROP_SUCCESS_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("Create Event", callback_data="event_create"),
+        InlineKeyboardButton("Join Event", callback_data="event_join")
+    ],
+    [InlineKeyboardButton("Back to Menu", callback_data="start")]
+])
+
+# Minimum time between faucet requests from the same user, in seconds
+FAUCET_COOLDOWN = 3600
+
+# Fallback in-process limiter, {user_id: monotonic request time}, oldest first;
+# expired entries are dropped from the front on each check, and the oldest entry
+# is evicted once MAX_FAUCET_REQUESTS users are tracked
+faucet_requests: "OrderedDict[int, float]" = OrderedDict()
+MAX_FAUCET_REQUESTS = 100_000
+
+# Optional Redis client; when set, the limit is a "faucet:{user_id}" key expiring
+# after FAUCET_COOLDOWN, shared between workers and kept across restarts
+_redis = None
+
+
+def init_redis(client) -> None:
+    """
+    Use the given Redis client (redis.asyncio.Redis) for faucet rate limiting.
+    
+    Args:
+        client: The Redis client, or None to fall back to the in-process limiter
+    """
+    global _redis
+    _redis = client
+
+
+def _faucet_key(user_id: int) -> str:
+    """Get the Redis key of a user's faucet cooldown."""
+    return f"faucet:{user_id}"
+
+
+async def _acquire_faucet_slot(user_id: int) -> Optional[int]:
+    """
+    Start a user's faucet cooldown unless one is already running.
+    
+    Args:
+        user_id: The user's Telegram ID
+        
+    Returns:
+        None if the cooldown was started, otherwise the seconds left on the running one
+    """
+    if _redis is not None:
+        key = _faucet_key(user_id)
+        if await _redis.set(key, "1", ex=FAUCET_COOLDOWN, nx=True):
+            return None
+        return max(await _redis.ttl(key), 0)
+        
+    now = time.monotonic()
+    while faucet_requests:
+        oldest_user, oldest_time = next(iter(faucet_requests.items()))
+        if now - oldest_time < FAUCET_COOLDOWN:
+            break
+        faucet_requests.popitem(last=False)
+        
+    last_request = faucet_requests.get(user_id)
+    if last_request is not None:
+        return int(FAUCET_COOLDOWN - (now - last_request))
+    faucet_requests[user_id] = now
+    if len(faucet_requests) > MAX_FAUCET_REQUESTS:
+        faucet_requests.popitem(last=False)
+    return None
+
+
+async def _release_faucet_slot(user_id: int) -> None:
+    """Clear a user's faucet cooldown, so a failed request can be retried."""
+    if _redis is not None:
+        await _redis.delete(_faucet_key(user_id))
+    else:
+        faucet_requests.pop(user_id, None)
 
 
 async def faucet_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -28,41 +109,40 @@ async def faucet_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if not user_wallet:
         await update.message.reply_text(
             "You need to connect your wallet first before requesting SOL.",
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect")]
-            ])
+            reply_markup=CONNECT_WALLET_KEYBOARD
         )
         return
     
-    # Check if user has requested recently (limit to once per hour)
-    if user_id in faucet_requests:
-        last_request = faucet_requests[user_id]
-        current_time = asyncio.get_event_loop().time()
-        
-        if current_time - last_request < 3600:  # 1 hour in seconds
-            minutes_left = int((3600 - (current_time - last_request)) / 60)
-            await update.message.reply_text(
-                f"You've already requested SOL recently. Please wait {minutes_left} minutes before requesting again.",
-                reply_markup=get_main_keyboard()
-            )
-            return
-    
-    # Get current balance
-    initial_balance = await get_sol_balance(user_wallet)
+    # Check if user has requested recently (limit to once per hour); the cooldown
+    # starts now so concurrent requests from the same user can't both get through
+    seconds_left = await _acquire_faucet_slot(user_id)
+    if seconds_left is not None:
+        minutes_left = seconds_left // 60
+        await update.message.reply_text(
+            f"You've already requested SOL recently. Please wait {minutes_left} minutes before requesting again.",
+            reply_markup=get_main_keyboard()
+        )
+        return
     
-    # Send initial message
-    message = await update.message.reply_text(
-        f"Requesting 1 SOL from Devnet faucet for {user.first_name}...\n"
-        f"Current balance: {initial_balance} SOL"
-    )
+    try:
+        # Get current balance
+        initial_balance = await get_sol_balance(user_wallet)
+        
+        # Send initial message
+        message = await update.message.reply_text(
+            f"Requesting 1 SOL from Devnet faucet for {user.first_name}...\n"
+            f"Current balance: {initial_balance} SOL"
+        )
+    except Exception:
+        # No airdrop was requested, so don't hold the user to the cooldown
+        await _release_faucet_slot(user_id)
+        raise
     
+    tx_signature = None
     try:
         # Request SOL from faucet
         tx_signature = await request_airdrop(user_wallet, 1.0)
         
-        # Update the request timestamp
-        faucet_requests[user_id] = asyncio.get_event_loop().time()
-        
         # Wait a moment for the transaction to complete
         await asyncio.sleep(2)
         
@@ -77,23 +157,18 @@ async def faucet_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             f"[View Transaction on Explorer](https://explorer.solana.com/tx/{tx_signature}?cluster=devnet)"
         )
         
-        keyboard = InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("Create Event", callback_data="event_create"),
-                InlineKeyboardButton("Join Event", callback_data="event_join")
-            ],
-            [InlineKeyboardButton("Back to Menu", callback_data="start")]
-        ])
-        
         await message.edit_text(
             success_text,
             parse_mode="Markdown",
-            reply_markup=keyboard,
+            reply_markup=AIRDROP_SUCCESS_KEYBOARD,
             disable_web_page_preview=True
         )
         
     except Exception as e:
         logger.error(f"Faucet error: {e}")
+        # Only a failed airdrop frees the cooldown; a failure after it landed keeps it
+        if tx_signature is None:
+            await _release_faucet_slot(user_id)
         await message.edit_text(
             "❌ There was an error requesting SOL from the faucet. Please try again later.",
             reply_markup=get_main_keyboard()
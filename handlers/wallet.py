@@ -2,6 +2,7 @@
 Wallet connection and management handlers for the SolMeet bot.
 """
 
+import asyncio
 import logging
 import json
 from typing import Dict, Any, Optional, Tuple
@@ -19,7 +20,7 @@ from utils.here_wallet import (
 )
 from utils.wallet_creator import get_wallet_info
 from utils.solana import get_sol_balance, format_wallet_address
-from utils.qr import generate_wallet_qr
+from utils.qr import get_wallet_qr_bytes
 from utils import (
     safe_message_reply, 
     safe_photo_reply, 
@@ -290,8 +291,9 @@ async def wallet_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 await safe_message_reply(query.message, "You don't have a wallet connected.")
                 return
                 
-            qr_path = generate_wallet_qr(user_wallet)
-            if not qr_path:
+            # Render and read the image in a worker thread to keep the event loop free
+            qr_bytes = await asyncio.to_thread(get_wallet_qr_bytes, user_wallet)
+            if not qr_bytes:
                 if not query.message:
                     logger.error("No message in callback query for wallet_qr")
                     return
@@ -305,7 +307,7 @@ async def wallet_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 
             await safe_photo_reply(
                 query.message,
-                photo=open(qr_path, "rb"),
+                photo=qr_bytes,
                 caption=f"QR Code for wallet: `{format_wallet_address(user_wallet)}`\n\n"
                 "Scan this QR code to see your wallet address.",
                 parse_mode="Markdown",
@@ -0,0 +1,203 @@
+"""
+Short-lived cache of per-event lookups for the SolMeet bot.
+Absorbs repeated event, organizer and join request lookups when many callbacks hit the same event.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from utils.join_requests import JoinRequest, get_event_by_id, get_event_requests
+from utils.participants import (
+    cache_event_participants,
+    count_event_participants,
+    events_participants,
+    read_event_participants,
+)
+from utils.solana import get_user_events
+
+logger = logging.getLogger(__name__)
+
+# How long cached values stay fresh, in seconds
+EVENT_TTL = 30.0
+REQUESTS_TTL = 5.0
+USER_EVENTS_TTL = 15.0
+
+# Number of shards; each shard has its own lock so a miss on one event
+# doesn't hold up lookups for unrelated events
+SHARD_COUNT = 16
+
+# Structure per shard: {(kind, event_id): (value, expires_at)}
+_SHARDS = [{} for _ in range(SHARD_COUNT)]
+_LOCKS = [asyncio.Lock() for _ in range(SHARD_COUNT)]
+
+def _shard(event_id: str) -> int:
+    """Get the shard index of an event."""
+    return hash(event_id) % SHARD_COUNT
+
+async def _get_or_load(
+    kind: str,
+    event_id: str,
+    ttl: float,
+    loader: Callable[[], Awaitable[Any]]
+) -> Any:
+    """
+    Return a cached value, loading it at most once per expiry even under concurrent misses.
+
+    Args:
+        kind: The kind of value cached (part of the cache key)
+        event_id: The event ID
+        ttl: How long a loaded value stays fresh, in seconds
+        loader: Coroutine function that loads the value on a miss
+
+    Returns:
+        The cached or freshly loaded value
+    """
+    index = _shard(event_id)
+    cache: Dict[Tuple[str, str], Tuple[Any, float]] = _SHARDS[index]
+    key = (kind, event_id)
+
+    entry = cache.get(key)
+    if entry and entry[1] > time.monotonic():
+        return entry[0]
+
+    async with _LOCKS[index]:
+        # Another coroutine may have loaded it while we waited for the lock
+        entry = cache.get(key)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+
+        value = await loader()
+        cache[key] = (value, time.monotonic() + ttl)
+        return value
+
+async def cached_event(event_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the event details, cached for EVENT_TTL seconds. The dict is shared; don't modify it.
+
+    Args:
+        event_id: The event ID
+
+    Returns:
+        The event data as a dictionary, or None if not found
+    """
+    return await _get_or_load(
+        "event", event_id, EVENT_TTL,
+        lambda: asyncio.to_thread(get_event_by_id, event_id)
+    )
+
+async def cached_organizer_id(event_id: str) -> Optional[int]:
+    """
+    Get the user ID of the event organizer from the cached event details.
+
+    Args:
+        event_id: The event ID
+
+    Returns:
+        The user ID of the event organizer, or None if not found
+    """
+    event = await cached_event(event_id)
+    organizer_id = event.get("creator_id") if event else None
+    try:
+        return int(organizer_id) if organizer_id else None
+    except (TypeError, ValueError):
+        logger.error("Invalid organizer ID for event %s: %s", event_id, organizer_id)
+        return None
+
+async def is_organizer(event_id: str, user_id: int) -> bool:
+    """
+    Check whether a user organizes an event, using the cached event details.
+
+    Args:
+        event_id: The event ID
+        user_id: The user ID to check
+
+    Returns:
+        True if the user is the event organizer, False otherwise
+    """
+    organizer_id = await cached_organizer_id(event_id)
+    return organizer_id is not None and organizer_id == user_id
+
+async def cached_event_requests(event_id: str) -> Dict[str, JoinRequest]:
+    """
+    Get the join requests for an event, cached for REQUESTS_TTL seconds.
+
+    Args:
+        event_id: The event ID
+
+    Returns:
+        A dictionary of wallet addresses to join requests
+    """
+    return await _get_or_load(
+        "requests", event_id, REQUESTS_TTL,
+        lambda: get_event_requests(event_id)
+    )
+
+async def cached_participant_count(event_id: str) -> int:
+    """
+    Get the number of participants in an event, cached for EVENT_TTL seconds.
+
+    Args:
+        event_id: The event ID
+
+    Returns:
+        The number of participants
+    """
+    return await _get_or_load(
+        "participants", event_id, EVENT_TTL,
+        lambda: _load_participant_count(event_id)
+    )
+
+async def _load_participant_count(event_id: str) -> int:
+    """Count an event's participants, reading its file off the event loop if it isn't in memory."""
+    if event_id not in events_participants:
+        # The worker thread only reads; the in-memory state is updated here on the loop,
+        # so a participant added while the file was being read is never lost
+        event_data = await asyncio.to_thread(read_event_participants, event_id)
+        if event_data is not None:
+            cache_event_participants(event_id, event_data)
+    return count_event_participants(event_id)
+
+def invalidate_participant_count(event_id: str) -> None:
+    """
+    Drop the cached participant count for an event after a participant is added.
+
+    Args:
+        event_id: The event ID
+    """
+    _SHARDS[_shard(event_id)].pop(("participants", event_id), None)
+
+async def cached_user_events(wallet_address: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Get the events created or joined by a wallet, cached for USER_EVENTS_TTL seconds.
+
+    Args:
+        wallet_address: The wallet address
+
+    Returns:
+        A dictionary with "created" and "joined" event lists
+    """
+    # Keyed by wallet rather than event; the shard hash works the same on any string
+    return await _get_or_load(
+        "user_events", wallet_address, USER_EVENTS_TTL,
+        lambda: get_user_events(wallet_address)
+    )
+
+def invalidate_user_events(wallet_address: str) -> None:
+    """
+    Drop the cached events of a wallet after it creates or joins an event.
+
+    Args:
+        wallet_address: The wallet address
+    """
+    _SHARDS[_shard(wallet_address)].pop(("user_events", wallet_address), None)
+
+def invalidate_event_requests(event_id: str) -> None:
+    """
+    Drop the cached join requests for an event after they change.
+
+    Args:
+        event_id: The event ID
+    """
+    _SHARDS[_shard(event_id)].pop(("requests", event_id), None)
@@ -3,18 +3,153 @@ Join request management utilities for the SolMeet bot.
 Handles tracking and processing of event join requests.
 """
 
-import json
 import logging
+import secrets
 import time
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
+import orjson
+
+from utils.persist_queue import enqueue_write
+
 logger = logging.getLogger(__name__)
 
 # In-memory cache of event join requests
 # Structure: {event_id: {wallet_address: {request_info}}}
 EVENT_REQUESTS = {}
 
+# Short tokens standing in for (event_id, wallet_address) in inline button data, which
+# Telegram caps at 64 bytes. Oldest tokens are evicted first once the cap is reached.
+CALLBACK_TOKENS: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+CALLBACK_TOKENS_BY_REQUEST: Dict[Tuple[str, str], str] = {}
+MAX_CALLBACK_TOKENS = 10_000
+CALLBACK_TOKEN_TTL = 7 * 24 * 60 * 60  # Expiry of tokens stored in Redis, in seconds
+
+# Optional Redis client; when set, join requests are stored in Redis instead of JSON files.
+# Layout: hash "req:{event_id}:{wallet}" per request, set "reqs:{event_id}" of wallets per event,
+# string "cb:{token}" holding "{event_id}:{wallet}" per callback token and
+# string "cbr:{event_id}:{wallet}" holding the token of each request.
+_redis = None
+
+@dataclass(slots=True, frozen=True)
+class JoinRequest:
+    """A user's request to join an event."""
+    user_id: int
+    wallet: str
+    username: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    status: str
+
+class AddResult(Enum):
+    """Outcome of adding a join request; existing requests report their status."""
+    ADDED = "added"
+    PENDING = "pending"
+    APPROVED = "approved"
+    DECLINED = "declined"
+    ERROR = "error"
+
+# Adds a request hash and indexes its wallet in one step unless the request already
+# exists, in which case the existing status is returned instead
+_ADD_REQUEST_SCRIPT = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if status then
+    return status
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('SADD', KEYS[2], ARGV[1])
+return false
+"""
+
+# Moves a request hash from "pending" to a new status in one step; returns the status
+# the request had, so callers can tell a missing request from one already decided
+_SET_STATUS_SCRIPT = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if status ~= 'pending' then
+    return status
+end
+redis.call('HSET', KEYS[1], unpack(ARGV))
+return status
+"""
+
+def init_redis(client) -> None:
+    """
+    Use the given Redis client (redis.asyncio.Redis with decode_responses=True) for join requests.
+    
+    Args:
+        client: The Redis client, or None to fall back to JSON files
+    """
+    global _redis
+    _redis = client
+
+def _request_key(event_id: str, wallet_address: str) -> str:
+    """Get the Redis key of a single join request."""
+    return f"req:{event_id}:{wallet_address}"
+
+def _event_requests_key(event_id: str) -> str:
+    """Get the Redis key of the set of wallets that requested to join an event."""
+    return f"reqs:{event_id}"
+
+def _encode_request(request_info: Dict[str, Any]) -> Dict[str, str]:
+    """Convert request info to a Redis hash mapping, dropping empty fields."""
+    return {k: str(v) for k, v in request_info.items() if v is not None}
+
+def _to_join_request(wallet_address: str, request_info: Dict[str, Any]) -> JoinRequest:
+    """Build a JoinRequest from stored request info (a JSON record or a Redis hash)."""
+    return JoinRequest(
+        user_id=int(request_info["user_id"]),
+        wallet=wallet_address,
+        username=request_info.get("username"),
+        first_name=request_info.get("first_name"),
+        last_name=request_info.get("last_name"),
+        status=request_info.get("status", "none")
+    )
+
+async def _set_request_status(event_id: str, wallet_address: str, status: str, by_user_id: int) -> bool:
+    """
+    Move a pending join request stored in Redis to a new status.
+    
+    Args:
+        event_id: The event ID
+        wallet_address: The requester's wallet address
+        status: The new status ("approved" or "declined")
+        by_user_id: User ID of the organizer making the change
+        
+    Returns:
+        True if the request was updated, False otherwise
+    """
+    # Check and update in one script, so two workers can't both approve the same request
+    fields = [
+        "status", status,
+        f"{status}_by", str(by_user_id),
+        f"{status}_at", str(time.time()),
+    ]
+    current_status = await _redis.eval(
+        _SET_STATUS_SCRIPT, 1, _request_key(event_id, wallet_address), *fields
+    )
+    
+    if current_status is None:
+        logger.error("Request not found for wallet %s in event %s", wallet_address, event_id)
+        return False
+        
+    if current_status != "pending":
+        logger.error("Request for wallet %s in event %s is not pending", wallet_address, event_id)
+        return False
+        
+    return True
+
+def _callback_token_key(token: str) -> str:
+    """Get the Redis key of a callback token."""
+    return f"cb:{token}"
+
+def _callback_request_key(event_id: str, wallet_address: str) -> str:
+    """Get the Redis key holding the callback token of a join request."""
+    return f"cbr:{event_id}:{wallet_address}"
+
 def ensure_requests_directory():
     """Ensure the join requests directory exists."""
     requests_dir = Path("join_requests")
@@ -29,16 +164,14 @@ def get_request_file_path(event_id: str) -> Path:
 def save_event_requests(event_id: str):
     """Save the event join requests to file."""
     if event_id not in EVENT_REQUESTS:
-        logger.warning(f"No requests to save for event {event_id}")
+        logger.warning("No requests to save for event %s", event_id)
         return False
     
     try:
-        file_path = get_request_file_path(event_id)
-        with open(file_path, "w") as f:
-            json.dump(EVENT_REQUESTS[event_id], f, indent=2)
+        enqueue_write(get_request_file_path(event_id), EVENT_REQUESTS[event_id], pretty=True)
         return True
     except Exception as e:
-        logger.error(f"Error saving requests for event {event_id}: {e}")
+        logger.error("Error saving requests for event %s: %s", event_id, e)
         return False
 
 def load_event_requests(event_id: str) -> bool:
@@ -55,24 +188,23 @@ def load_event_requests(event_id: str) -> bool:
         return False
     
     try:
-        with open(file_path, "r") as f:
-            EVENT_REQUESTS[event_id] = json.load(f)
+        EVENT_REQUESTS[event_id] = orjson.loads(file_path.read_bytes())
         return True
     except Exception as e:
-        logger.error(f"Error loading requests for event {event_id}: {e}")
+        logger.error("Error loading requests for event %s: %s", event_id, e)
         EVENT_REQUESTS[event_id] = {}
         return False
 
-def add_join_request(
+async def add_join_request(
     event_id: str, 
     wallet_address: str, 
     user_id: int, 
     username: Optional[str] = None,
     first_name: Optional[str] = None,
     last_name: Optional[str] = None
-) -> bool:
+) -> AddResult:
     """
-    Add a join request for an event.
+    Add a join request for an event unless the wallet already has one.
     
     Args:
         event_id: The event ID
@@ -83,9 +215,28 @@ def add_join_request(
         last_name: The requester's last name (optional)
         
     Returns:
-        True if the request was added successfully, False otherwise
+        AddResult.ADDED if a new request was added, the status of the existing
+        request if there was one, or AddResult.ERROR on failure
     """
     try:
+        request_info = {
+            "user_id": user_id,
+            "username": username,
+            "first_name": first_name,
+            "last_name": last_name,
+            "requested_at": time.time(),
+            "status": "pending"
+        }
+        
+        if _redis is not None:
+            fields = [item for pair in _encode_request(request_info).items() for item in pair]
+            existing_status = await _redis.eval(
+                _ADD_REQUEST_SCRIPT, 2,
+                _request_key(event_id, wallet_address), _event_requests_key(event_id),
+                wallet_address, *fields
+            )
+            return AddResult(existing_status) if existing_status else AddResult.ADDED
+        
         # Load existing requests
         if event_id not in EVENT_REQUESTS:
             load_event_requests(event_id)
@@ -94,23 +245,21 @@ def add_join_request(
         if event_id not in EVENT_REQUESTS:
             EVENT_REQUESTS[event_id] = {}
             
+        # Keep an existing request as it is
+        existing = EVENT_REQUESTS[event_id].get(wallet_address)
+        if existing:
+            return AddResult(existing.get("status", "pending"))
+            
         # Add the request
-        EVENT_REQUESTS[event_id][wallet_address] = {
-            "user_id": user_id,
-            "username": username,
-            "first_name": first_name,
-            "last_name": last_name,
-            "requested_at": time.time(),
-            "status": "pending"
-        }
+        EVENT_REQUESTS[event_id][wallet_address] = request_info
         
         # Save to file
-        return save_event_requests(event_id)
+        return AddResult.ADDED if save_event_requests(event_id) else AddResult.ERROR
     except Exception as e:
-        logger.error(f"Error adding join request: {e}")
-        return False
+        logger.error("Error adding join request: %s", e)
+        return AddResult.ERROR
 
-def get_event_requests(event_id: str) -> Dict[str, Dict[str, Any]]:
+async def get_event_requests(event_id: str) -> Dict[str, JoinRequest]:
     """
     Get the pending join requests for an event.
     
@@ -118,14 +267,27 @@ def get_event_requests(event_id: str) -> Dict[str, Dict[str, Any]]:
         event_id: The event ID
         
     Returns:
-        A dictionary of wallet addresses to request info
+        A dictionary of wallet addresses to join requests
     """
+    if _redis is not None:
+        wallets = list(await _redis.smembers(_event_requests_key(event_id)))
+        if not wallets:
+            return {}
+        async with _redis.pipeline(transaction=False) as pipe:
+            for wallet in wallets:
+                pipe.hgetall(_request_key(event_id, wallet))
+            rows = await pipe.execute()
+        return {wallet: _to_join_request(wallet, row) for wallet, row in zip(wallets, rows) if row}
+        
     if event_id not in EVENT_REQUESTS:
         load_event_requests(event_id)
         
-    return EVENT_REQUESTS.get(event_id, {})
+    return {
+        wallet: _to_join_request(wallet, request_info)
+        for wallet, request_info in EVENT_REQUESTS.get(event_id, {}).items()
+    }
 
-def count_event_requests(event_id: str) -> int:
+async def count_event_requests(event_id: str) -> int:
     """
     Count the number of pending join requests for an event.
     
@@ -135,10 +297,10 @@ def count_event_requests(event_id: str) -> int:
     Returns:
         The number of pending requests
     """
-    requests = get_event_requests(event_id)
-    return sum(1 for req in requests.values() if req.get("status") == "pending")
+    requests = await get_event_requests(event_id)
+    return sum(1 for req in requests.values() if req.status == "pending")
 
-def approve_join_request(
+async def approve_join_request(
     event_id: str, 
     wallet_address: str,
     approved_by_user_id: int
@@ -155,18 +317,21 @@ def approve_join_request(
         True if the request was approved successfully, False otherwise
     """
     try:
+        if _redis is not None:
+            return await _set_request_status(event_id, wallet_address, "approved", approved_by_user_id)
+            
         # Load requests if not already loaded
         if event_id not in EVENT_REQUESTS:
             load_event_requests(event_id)
             
         # Check if the request exists
         if event_id not in EVENT_REQUESTS or wallet_address not in EVENT_REQUESTS[event_id]:
-            logger.error(f"Request not found for wallet {wallet_address} in event {event_id}")
+            logger.error("Request not found for wallet %s in event %s", wallet_address, event_id)
             return False
             
         # Check if the request is pending
         if EVENT_REQUESTS[event_id][wallet_address].get("status") != "pending":
-            logger.error(f"Request for wallet {wallet_address} in event {event_id} is not pending")
+            logger.error("Request for wallet %s in event %s is not pending", wallet_address, event_id)
             return False
             
         # Update the request status
@@ -177,10 +342,10 @@ def approve_join_request(
         # Save to file
         return save_event_requests(event_id)
     except Exception as e:
-        logger.error(f"Error approving join request: {e}")
+        logger.error("Error approving join request: %s", e)
         return False
 
-def decline_join_request(
+async def decline_join_request(
     event_id: str, 
     wallet_address: str,
     declined_by_user_id: int
@@ -197,18 +362,21 @@ def decline_join_request(
         True if the request was declined successfully, False otherwise
     """
     try:
+        if _redis is not None:
+            return await _set_request_status(event_id, wallet_address, "declined", declined_by_user_id)
+            
         # Load requests if not already loaded
         if event_id not in EVENT_REQUESTS:
             load_event_requests(event_id)
             
         # Check if the request exists
         if event_id not in EVENT_REQUESTS or wallet_address not in EVENT_REQUESTS[event_id]:
-            logger.error(f"Request not found for wallet {wallet_address} in event {event_id}")
+            logger.error("Request not found for wallet %s in event %s", wallet_address, event_id)
             return False
             
         # Check if the request is pending
         if EVENT_REQUESTS[event_id][wallet_address].get("status") != "pending":
-            logger.error(f"Request for wallet {wallet_address} in event {event_id} is not pending")
+            logger.error("Request for wallet %s in event %s is not pending", wallet_address, event_id)
             return False
             
         # Update the request status
@@ -219,7 +387,7 @@ def decline_join_request(
         # Save to file
         return save_event_requests(event_id)
     except Exception as e:
-        logger.error(f"Error declining join request: {e}")
+        logger.error("Error declining join request: %s", e)
         return False
 
 def get_event_by_id(event_id: str) -> Optional[Dict[str, Any]]:
@@ -238,16 +406,15 @@ def get_event_by_id(event_id: str) -> Optional[Dict[str, Any]]:
         event_file = events_dir / f"{event_id}.json"
         
         if not event_file.exists():
-            logger.error(f"Event file not found for event {event_id}")
+            logger.error("Event file not found for event %s", event_id)
             return None
             
         # Load the event data
-        with open(event_file, "r") as f:
-            event_data = json.load(f)
+        event_data = orjson.loads(event_file.read_bytes())
             
         return event_data
     except Exception as e:
-        logger.error(f"Error loading event data: {e}")
+        logger.error("Error loading event data: %s", e)
         return None
 
 
@@ -274,10 +441,10 @@ def get_event_organizer_id(event_id: str) -> Optional[int]:
             
         return None
     except Exception as e:
-        logger.error(f"Error getting event organizer: {e}")
+        logger.error("Error getting event organizer: %s", e)
         return None
 
-def get_request_status(event_id: str, wallet_address: str) -> str:
+async def get_request_status(event_id: str, wallet_address: str) -> str:
     """
     Get the status of a join request.
     
@@ -289,6 +456,10 @@ def get_request_status(event_id: str, wallet_address: str) -> str:
         The status of the request ("pending", "approved", "declined", or "none")
     """
     try:
+        if _redis is not None:
+            status = await _redis.hget(_request_key(event_id, wallet_address), "status")
+            return status or "none"
+            
         # Load requests if not already loaded
         if event_id not in EVENT_REQUESTS:
             load_event_requests(event_id)
@@ -300,46 +471,48 @@ def get_request_status(event_id: str, wallet_address: str) -> str:
         # Return the status
         return EVENT_REQUESTS[event_id][wallet_address].get("status", "none")
     except Exception as e:
-        logger.error(f"Error getting request status: {e}")
+        logger.error("Error getting request status: %s", e)
         return "none"
 
-def format_request_name(request_info: Dict[str, Any]) -> str:
+def format_request_name(request: Optional[JoinRequest]) -> str:
     """
     Format a requester's name for display.
     
     Args:
-        request_info: The request info dictionary
+        request: The join request
         
     Returns:
         A formatted display name
     """
-    if not request_info:
+    if not request:
         return "Unknown User"
         
     # Try to format the name
-    if request_info.get("username"):
-        return f"@{request_info['username']}"
-    elif request_info.get("first_name"):
-        if request_info.get("last_name"):
-            return f"{request_info['first_name']} {request_info['last_name']}"
-        return request_info["first_name"]
+    if request.username:
+        return f"@{request.username}"
+    elif request.first_name:
+        if request.last_name:
+            return f"{request.first_name} {request.last_name}"
+        return request.first_name
     else:
-        return f"User {request_info.get('user_id', 'Unknown')}"
+        return f"User {request.user_id}"
 
-def format_requests_list(event_id: str) -> str:
+async def format_requests_list(event_id: str, requests: Optional[Dict[str, JoinRequest]] = None) -> str:
     """
     Format the list of pending requests for display.
     
     Args:
         event_id: The event ID
+        requests: The event's requests, if the caller already fetched them
         
     Returns:
         A formatted string listing the pending requests
     """
-    requests = get_event_requests(event_id)
+    if requests is None:
+        requests = await get_event_requests(event_id)
     
     # Filter for pending requests
-    pending_requests = {k: v for k, v in requests.items() if v.get("status") == "pending"}
+    pending_requests = {k: v for k, v in requests.items() if v.status == "pending"}
     
     if not pending_requests:
         return "No pending join requests for this event."
@@ -351,4 +524,61 @@ def format_requests_list(event_id: str) -> str:
         wallet_short = f"{wallet[:6]}...{wallet[-4:]}"
         result.append(f"• {name} ({wallet_short})")
         
-    return "\n".join(result)
\ No newline at end of file
+    return "\n".join(result)
+
+async def register_callback_token(event_id: str, wallet_address: str) -> str:
+    """
+    Get the short token for a join request to use in inline button callback data.
+    
+    A request keeps the same token for as long as the token is alive, and each
+    registration extends its life.
+    
+    Args:
+        event_id: The event ID
+        wallet_address: The requester's wallet address
+        
+    Returns:
+        The token
+    """
+    if _redis is not None:
+        reverse_key = _callback_request_key(event_id, wallet_address)
+        token = secrets.token_urlsafe(6)
+        if not await _redis.set(reverse_key, token, ex=CALLBACK_TOKEN_TTL, nx=True):
+            token = await _redis.get(reverse_key) or token
+        async with _redis.pipeline(transaction=False) as pipe:
+            pipe.set(_callback_token_key(token), f"{event_id}:{wallet_address}", ex=CALLBACK_TOKEN_TTL)
+            pipe.expire(reverse_key, CALLBACK_TOKEN_TTL)
+            await pipe.execute()
+        return token
+        
+    token = CALLBACK_TOKENS_BY_REQUEST.get((event_id, wallet_address))
+    if token is not None:
+        CALLBACK_TOKENS.move_to_end(token)
+        return token
+        
+    token = secrets.token_urlsafe(6)
+    CALLBACK_TOKENS[token] = (event_id, wallet_address)
+    CALLBACK_TOKENS_BY_REQUEST[(event_id, wallet_address)] = token
+    if len(CALLBACK_TOKENS) > MAX_CALLBACK_TOKENS:
+        _, evicted = CALLBACK_TOKENS.popitem(last=False)
+        CALLBACK_TOKENS_BY_REQUEST.pop(evicted, None)
+    return token
+
+async def resolve_callback_token(token: str) -> Optional[Tuple[str, str]]:
+    """
+    Look up the join request a callback token was registered for.
+    
+    Args:
+        token: The token from the callback data
+        
+    Returns:
+        The (event_id, wallet_address) pair, or None if the token is unknown or expired
+    """
+    if _redis is not None:
+        value = await _redis.get(_callback_token_key(token))
+        if value is None:
+            return None
+        event_id, _, wallet_address = value.partition(":")
+        return event_id, wallet_address
+        
+    return CALLBACK_TOKENS.get(token)
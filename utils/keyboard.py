@@ -5,43 +5,49 @@ Custom keyboard utilities for the SolMeet bot.
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 
 
+# Static keyboards, built once at import; the getters hand out the shared instances
+MAIN_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect"),
+        InlineKeyboardButton("My Wallet", callback_data="wallet_info")
+    ],
+    [
+        InlineKeyboardButton("Create Event", callback_data="event_create"),
+        InlineKeyboardButton("Join Event", callback_data="event_join")
+    ],
+    [
+        InlineKeyboardButton("My Events", callback_data="event_list_mine"),
+        InlineKeyboardButton("Get Devnet SOL", callback_data="wallet_faucet")
+    ]
+])
+CANCEL_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Cancel", callback_data="event_cancel")]
+])
+WALLET_REQUIRED_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect")],
+    [InlineKeyboardButton("Back to Menu", callback_data="start")]
+])
+
+
 def get_main_keyboard() -> InlineKeyboardMarkup:
     """
     Returns the main menu keyboard with common actions.
     """
-    return InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect"),
-            InlineKeyboardButton("My Wallet", callback_data="wallet_info")
-        ],
-        [
-            InlineKeyboardButton("Create Event", callback_data="event_create"),
-            InlineKeyboardButton("Join Event", callback_data="event_join")
-        ],
-        [
-            InlineKeyboardButton("My Events", callback_data="event_list_mine"),
-            InlineKeyboardButton("Get Devnet SOL", callback_data="wallet_faucet")
-        ]
-    ])
+    return MAIN_KEYBOARD
 
 
 def get_cancel_keyboard() -> InlineKeyboardMarkup:
     """
     Returns a keyboard with just a cancel button for flows that can be canceled.
     """
-    return InlineKeyboardMarkup([
-        [InlineKeyboardButton("Cancel", callback_data="event_cancel")]
-    ])
+    return CANCEL_KEYBOARD
 
 
 def get_wallet_required_keyboard() -> InlineKeyboardMarkup:
     """
     Returns a keyboard for prompting users to connect their wallet.
     """
-    return InlineKeyboardMarkup([
-        [InlineKeyboardButton("Connect Wallet", callback_data="wallet_connect")],
-        [InlineKeyboardButton("Back to Menu", callback_data="start")]
-    ])
+    return WALLET_REQUIRED_KEYBOARD
 
 
 def get_event_actions_keyboard(event_id: str) -> InlineKeyboardMarkup:
@@ -0,0 +1,184 @@
+"""
+Outbound message queue for the SolMeet bot.
+Decouples notification sends from update handling and coalesces bursts to the same chat.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import TelegramError
+
+logger = logging.getLogger(__name__)
+
+# Messages queued for the same chat within this many seconds are sent as one
+COALESCE_WINDOW = 2.0
+
+# Minimum time between two sends to the same chat, in seconds. The bot's AIORateLimiter
+# only throttles group chats, and these notifications go to private chats.
+PER_CHAT_INTERVAL = 1.0
+MAX_TRACKED_CHATS = 10_000
+
+# How long stopping waits for the worker to send what is still queued, in seconds
+STOP_TIMEOUT = 30.0
+
+# Queue of pending messages and the worker draining it; None asks the worker to
+# send what it has and stop
+OUTBOUND_QUEUE: "asyncio.Queue[Optional[SendSpec]]" = asyncio.Queue()
+_worker: Optional[asyncio.Task] = None
+
+# Structure: {chat_id: monotonic time of the last send}
+_last_sent: Dict[int, float] = {}
+
+@dataclass(slots=True, frozen=True)
+class SendSpec:
+    """A queued message, plus how to list it when coalesced with others."""
+    chat_id: int
+    text: str
+    reply_markup: Optional[InlineKeyboardMarkup] = None
+    parse_mode: Optional[str] = "HTML"
+    # One-line summary and button used in place of the full message when coalescing
+    summary: str = ""
+    summary_button: Optional[InlineKeyboardButton] = None
+    # Header of the coalesced message; "{count}" is replaced with the number of messages
+    summary_header: str = "🔔 <b>{count} New Notifications</b>"
+
+def enqueue_message(spec: SendSpec) -> None:
+    """
+    Queue a message to be sent by the outbound worker.
+
+    Args:
+        spec: The message to send
+    """
+    OUTBOUND_QUEUE.put_nowait(spec)
+
+async def _send_batch(bot: Bot, chat_id: int, specs: List[SendSpec]) -> None:
+    """
+    Send the messages queued for one chat, as a single message if there are several.
+
+    Args:
+        bot: The bot to send with
+        chat_id: The chat to send to
+        specs: The queued messages for the chat, oldest first
+    """
+    parse_mode = specs[0].parse_mode
+    if len(specs) == 1:
+        text, reply_markup = specs[0].text, specs[0].reply_markup
+    else:
+        lines = [specs[0].summary_header.format(count=len(specs)), ""]
+        lines.extend(f"• {spec.summary}" for spec in specs)
+        text = "\n".join(lines)
+
+        # One button per distinct target, e.g. one "View All Requests" per event
+        buttons = {}
+        for spec in specs:
+            if spec.summary_button:
+                buttons.setdefault(spec.summary_button.callback_data, spec.summary_button)
+        reply_markup = InlineKeyboardMarkup([[button] for button in buttons.values()]) if buttons else None
+
+    # Space sends to the same chat at least PER_CHAT_INTERVAL apart
+    loop = asyncio.get_running_loop()
+    wait = _last_sent.get(chat_id, float("-inf")) + PER_CHAT_INTERVAL - loop.time()
+    if wait > 0:
+        await asyncio.sleep(wait)
+    if len(_last_sent) >= MAX_TRACKED_CHATS:
+        cutoff = loop.time() - PER_CHAT_INTERVAL
+        for stale in [c for c, t in _last_sent.items() if t <= cutoff]:
+            del _last_sent[stale]
+    _last_sent[chat_id] = loop.time()
+
+    try:
+        await bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode, reply_markup=reply_markup)
+    except TelegramError as e:
+        logger.error("Error sending queued message to %s: %s", chat_id, e)
+
+async def _send_grouped(bot: Bot, batch: List[SendSpec]) -> None:
+    """
+    Send a batch of queued messages, one message per chat.
+
+    Args:
+        bot: The bot to send with
+        batch: The queued messages, oldest first
+    """
+    # Any failure is logged and the batch dropped; the worker must keep running,
+    # or every later message would wait in the queue forever
+    try:
+        by_chat: Dict[int, List[SendSpec]] = defaultdict(list)
+        for spec in batch:
+            by_chat[spec.chat_id].append(spec)
+
+        results = await asyncio.gather(
+            *(_send_batch(bot, chat_id, specs) for chat_id, specs in by_chat.items()),
+            return_exceptions=True
+        )
+    except Exception:
+        logger.exception("Error sending a batch of %d queued messages", len(batch))
+        return
+
+    for chat_id, result in zip(by_chat, results):
+        if isinstance(result, Exception):
+            logger.error("Error sending queued messages to %s", chat_id, exc_info=result)
+
+async def _outbound_worker(bot: Bot) -> None:
+    """
+    Send queued messages, grouping those for the same chat within COALESCE_WINDOW.
+
+    Stops after sending everything queued once it takes None off the queue.
+
+    Args:
+        bot: The bot to send with
+    """
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        spec = await OUTBOUND_QUEUE.get()
+        if spec is None:
+            break
+        batch = [spec]
+        deadline = loop.time() + COALESCE_WINDOW
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                spec = await asyncio.wait_for(OUTBOUND_QUEUE.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if spec is None:
+                stopping = True
+                break
+            batch.append(spec)
+
+        await _send_grouped(bot, batch)
+
+    # Send anything queued behind the stop request as well
+    remaining_specs = []
+    while not OUTBOUND_QUEUE.empty():
+        spec = OUTBOUND_QUEUE.get_nowait()
+        if spec is not None:
+            remaining_specs.append(spec)
+    if remaining_specs:
+        await _send_grouped(bot, remaining_specs)
+
+def start_outbound_worker(bot: Bot) -> None:
+    """
+    Start the worker that sends queued messages.
+
+    Args:
+        bot: The bot to send with
+    """
+    global _worker
+    _worker = asyncio.create_task(_outbound_worker(bot))
+
+async def stop_outbound_worker() -> None:
+    """Stop the outbound worker once it has sent the messages still queued."""
+    global _worker
+    if _worker is None:
+        return
+
+    OUTBOUND_QUEUE.put_nowait(None)
+    try:
+        await asyncio.wait_for(_worker, STOP_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.error("Outbound worker did not finish sending within %s seconds", STOP_TIMEOUT)
+    _worker = None
@@ -4,11 +4,14 @@ Handles tracking event participants and sending notifications.
 """
 
 import logging
-import json
 import time
-from typing import Dict, List, Optional, Set, Any
+from typing import Dict, Optional, Set, Any
 from pathlib import Path
 
+import orjson
+
+from utils.persist_queue import enqueue_write
+
 logger = logging.getLogger(__name__)
 
 # Define the participants storage directory
@@ -39,38 +42,57 @@ def save_event_participants(event_id: str):
             "last_updated": int(time.time())
         }
         
-        with open(file_path, 'w') as f:
-            json.dump(event_data, f)
-            
+        enqueue_write(file_path, event_data)
         logger.info(f"Saved participants data for event {event_id}")
     except Exception as e:
         logger.error(f"Error saving participants for event {event_id}: {e}")
 
-def load_event_participants(event_id: str) -> bool:
+def read_event_participants(event_id: str) -> Optional[Dict[str, Any]]:
     """
-    Load the event participants from file.
+    Read an event's participants file without touching the in-memory cache.
+    
+    Safe to call from a worker thread; install the result on the event loop with
+    cache_event_participants.
     
     Returns:
-        True if the file was loaded successfully, False otherwise
+        The stored event data, or None if there is no file or it could not be read
     """
     try:
         file_path = get_event_file_path(event_id)
         if not file_path.exists():
             logger.info(f"No participants file exists for event {event_id}")
-            return False
-            
-        with open(file_path, 'r') as f:
-            event_data = json.load(f)
+            return None
             
-        # Update the in-memory cache
-        events_participants[event_id] = event_data.get("participants", {})
-        notifications_subscribers[event_id] = event_data.get("subscribers", [])
-        
-        logger.info(f"Loaded participants data for event {event_id}")
-        return True
+        return orjson.loads(file_path.read_bytes())
     except Exception as e:
         logger.error(f"Error loading participants for event {event_id}: {e}")
+        return None
+
+def cache_event_participants(event_id: str, event_data: Dict[str, Any]) -> None:
+    """
+    Put an event's stored data in the in-memory cache unless the event is already there,
+    so state changed in memory since the file was read is never replaced.
+    """
+    events_participants.setdefault(event_id, event_data.get("participants", {}))
+    notifications_subscribers.setdefault(event_id, event_data.get("subscribers", []))
+
+def load_event_participants(event_id: str) -> bool:
+    """
+    Load the event participants from file.
+    
+    Returns:
+        True if the file was loaded successfully, False otherwise
+    """
+    event_data = read_event_participants(event_id)
+    if event_data is None:
         return False
+        
+    # Update the in-memory cache
+    events_participants[event_id] = event_data.get("participants", {})
+    notifications_subscribers[event_id] = event_data.get("subscribers", [])
+    
+    logger.info(f"Loaded participants data for event {event_id}")
+    return True
 
 def add_event_participant(
     event_id: str, 
@@ -79,7 +101,7 @@ def add_event_participant(
     username: Optional[str] = None,
     first_name: Optional[str] = None,
     last_name: Optional[str] = None
-) -> bool:
+) -> Optional[int]:
     """
     Add a participant to an event and notify subscribers.
     
@@ -92,7 +114,7 @@ def add_event_participant(
         last_name: The participant's last name (optional)
         
     Returns:
-        True if the participant was added successfully, False otherwise
+        The number of participants after the add, or None if the participant could not be added
     """
     # Load the current participants if not already in memory
     if event_id not in events_participants:
@@ -120,7 +142,54 @@ def add_event_participant(
     save_event_participants(event_id)
     
     logger.info(f"Added participant {wallet_address} (user: {user_id}) to event {event_id}")
-    return True
+    return len(events_participants[event_id])
+
+def register_event_creator(
+    event_id: str,
+    wallet_address: str,
+    user_id: int,
+    username: Optional[str] = None,
+    first_name: Optional[str] = None,
+    last_name: Optional[str] = None
+) -> None:
+    """
+    Add an event's creator as its first participant and subscribe them to its notifications,
+    saving the participants file once.
+    
+    Args:
+        event_id: The event ID
+        wallet_address: The creator's wallet address
+        user_id: The creator's Telegram user ID
+        username: The creator's Telegram username (optional)
+        first_name: The creator's first name (optional)
+        last_name: The creator's last name (optional)
+    """
+    # Load the current state if not already in memory
+    if event_id not in events_participants or event_id not in notifications_subscribers:
+        load_event_participants(event_id)
+    participants = events_participants.setdefault(event_id, {})
+    subscribers = notifications_subscribers.setdefault(event_id, [])
+    
+    user_info = {
+        "user_id": user_id,
+        "joined_at": int(time.time())
+    }
+    
+    if username:
+        user_info["username"] = username
+    if first_name:
+        user_info["first_name"] = first_name
+    if last_name:
+        user_info["last_name"] = last_name
+        
+    participants[wallet_address] = user_info
+    if user_id not in subscribers:
+        subscribers.append(user_id)
+        
+    # Save to disk
+    save_event_participants(event_id)
+    
+    logger.info(f"Registered creator {wallet_address} (user: {user_id}) for event {event_id}")
 
 def remove_event_participant(event_id: str, wallet_address: str) -> bool:
     """
@@ -245,23 +314,24 @@ def unsubscribe_from_event_notifications(event_id: str, user_id: int) -> bool:
         logger.info(f"User {user_id} is not subscribed to notifications for event {event_id}")
         return False
 
-def get_event_notification_subscribers(event_id: str) -> List[int]:
+def get_event_notification_subscribers(event_id: str) -> Set[int]:
     """
-    Get the list of user IDs subscribed to notifications for an event.
+    Get the user IDs subscribed to notifications for an event.
     
     Args:
         event_id: The event ID
         
     Returns:
-        A list of user IDs
+        A new set of user IDs, safe for the caller to modify
     """
     # Load the current subscribers if not already in memory
     if event_id not in notifications_subscribers:
         load_event_participants(event_id)
         if event_id not in notifications_subscribers:
-            return []
+            return set()
             
-    return notifications_subscribers[event_id]
+    # Stored as a list so it serializes to JSON as-is
+    return set(notifications_subscribers[event_id])
 
 def format_participant_name(participant_info: Dict[str, Any]) -> str:
     """
@@ -0,0 +1,109 @@
+"""
+Background JSON persistence for the SolMeet bot.
+Moves state file writes off the event loop and coalesces repeated writes to the same file.
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import aiofiles
+import aiofiles.os
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Writes queued for the same file within this many seconds are written once
+WRITE_COALESCE_WINDOW = 0.1
+
+# Queue of (path, state, pretty) writes and the writer draining it
+WRITE_QUEUE: "asyncio.Queue[Tuple[Path, Any, bool]]" = asyncio.Queue()
+_writer: Optional[asyncio.Task] = None
+
+# Writes taken off the queue but not yet on disk, latest state per path
+_batch: Dict[Path, Tuple[Any, bool]] = {}
+
+def _dumps(state: Any, pretty: bool) -> bytes:
+    """Serialize state to JSON bytes."""
+    return orjson.dumps(state, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+def _write_sync(path: Path, state: Any, pretty: bool) -> None:
+    """Write state to a JSON file, replacing it atomically."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(_dumps(state, pretty))
+    os.replace(tmp_path, path)
+
+async def _write(path: Path, state: Any, pretty: bool) -> None:
+    """Write state to a JSON file without blocking the event loop, replacing it atomically."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    # Serialize on the loop so the snapshot can't race with in-memory updates
+    data = _dumps(state, pretty)
+    async with aiofiles.open(tmp_path, "wb") as f:
+        await f.write(data)
+    await aiofiles.os.replace(tmp_path, path)
+
+def enqueue_write(path: Path, state: Any, pretty: bool = False) -> None:
+    """
+    Persist state to a JSON file in the background, or right away if the writer isn't running.
+
+    The state is serialized when it is written, so later in-memory changes to the
+    same object are picked up by a pending write.
+
+    Args:
+        path: The file to write
+        state: The JSON-serializable state
+        pretty: Whether to indent the JSON by two spaces
+    """
+    if _writer is None:
+        _write_sync(path, state, pretty)
+        return
+    WRITE_QUEUE.put_nowait((path, state, pretty))
+
+async def _persist_writer() -> None:
+    """Write queued state files, keeping only the latest state per file within WRITE_COALESCE_WINDOW."""
+    while True:
+        path, state, pretty = await WRITE_QUEUE.get()
+        _batch[path] = (state, pretty)
+        await asyncio.sleep(WRITE_COALESCE_WINDOW)
+        while not WRITE_QUEUE.empty():
+            path, state, pretty = WRITE_QUEUE.get_nowait()
+            _batch[path] = (state, pretty)
+
+        while _batch:
+            path = next(iter(_batch))
+            state, pretty = _batch[path]
+            try:
+                await _write(path, state, pretty)
+            except Exception as e:
+                logger.error("Error writing %s: %s", path, e)
+            _batch.pop(path, None)
+
+def start_persist_writer() -> None:
+    """Start the background writer; until then writes happen synchronously."""
+    global _writer
+    _writer = asyncio.create_task(_persist_writer())
+
+async def stop_persist_writer() -> None:
+    """Stop the background writer and flush any writes still pending."""
+    global _writer
+    if _writer is None:
+        return
+
+    _writer.cancel()
+    try:
+        await _writer
+    except asyncio.CancelledError:
+        pass
+    _writer = None
+
+    while not WRITE_QUEUE.empty():
+        path, state, pretty = WRITE_QUEUE.get_nowait()
+        _batch[path] = (state, pretty)
+    for path, (state, pretty) in _batch.items():
+        try:
+            _write_sync(path, state, pretty)
+        except Exception as e:
+            logger.error("Error writing %s: %s", path, e)
+    _batch.clear()
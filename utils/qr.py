@@ -5,7 +5,9 @@ QR code generation utilities for the SolMeet bot.
 import base64
 import logging
 import os
+import threading
 import qrcode
+from collections import OrderedDict
 from io import BytesIO
 from typing import Optional, Tuple
 from pathlib import Path
@@ -16,6 +18,11 @@ logger = logging.getLogger(__name__)
 # Directory to store generated QR codes
 QR_DIR = Path("./qr_codes")
 
+# In-memory LRU of join QR images, {event_id: png_bytes}; shared with worker threads
+_JOIN_QR_BYTES: "OrderedDict[str, bytes]" = OrderedDict()
+_JOIN_QR_LOCK = threading.Lock()
+MAX_JOIN_QR_BYTES = 512
+
 def ensure_qr_directory():
     """Ensure the QR codes directory exists."""
     if not QR_DIR.exists():
@@ -23,78 +30,104 @@ def ensure_qr_directory():
         logger.info(f"Created QR codes directory at {QR_DIR}")
 
 
-def generate_event_qr(event_id: str, event_name: str = None) -> str:
+def _remember_join_qr(event_id: str, data: bytes) -> None:
+    """Add an event's join QR image to the in-memory LRU."""
+    with _JOIN_QR_LOCK:
+        _JOIN_QR_BYTES[event_id] = data
+        if len(_JOIN_QR_BYTES) > MAX_JOIN_QR_BYTES:
+            _JOIN_QR_BYTES.popitem(last=False)
+
+
+def _render_event_qr(event_id: str, event_name: str = None) -> Image.Image:
     """
-    Generate a QR code for an event and save it to a file.
+    Render the join QR code for an event, with the event name underneath if given.
     
     Args:
         event_id: The ID of the event to encode in the QR code
         event_name: Optional name to display on the QR code
     
     Returns:
-        The path to the saved QR code image
+        The QR code image
     """
-    ensure_qr_directory()
+    # Create a unique data string for the QR code that includes the event ID
+    data = f"solmeet://join/{event_id}"
     
-    try:
-        # Create a unique data string for the QR code that includes the event ID
-        data = f"solmeet://join/{event_id}"
+    # Generate QR code
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    
+    # Create an image from the QR code
+    img = qr.make_image(fill_color="black", back_color="white")
+    
+    # If event name is provided, add it to the image
+    if event_name:
+        # Convert to PIL Image if it's not already
+        if not isinstance(img, Image.Image):
+            img = img.get_image()
         
-        # Generate QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
+        # Create a new image with extra space for the text
+        width, height = img.size
+        new_img = Image.new('RGB', (width, height + 30), color='white')
+        new_img.paste(img, (0, 0))
         
-        # Create an image from the QR code
-        img = qr.make_image(fill_color="black", back_color="white")
+        # Add text
+        draw = ImageDraw.Draw(new_img)
         
-        # If event name is provided, add it to the image
-        if event_name:
-            # Convert to PIL Image if it's not already
-            if not isinstance(img, Image.Image):
-                img = img.get_image()
-            
-            # Create a new image with extra space for the text
-            width, height = img.size
-            new_img = Image.new('RGB', (width, height + 30), color='white')
-            new_img.paste(img, (0, 0))
+        # Try to use a nice font, or fall back to default
+        try:
+            # Try a common font path
+            font_path = None
+            for path in ["/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 
+                         "/usr/share/fonts/TTF/DejaVuSans.ttf"]:
+                if os.path.exists(path):
+                    font_path = path
+                    break
             
-            # Add text
-            draw = ImageDraw.Draw(new_img)
-            
-            # Try to use a nice font, or fall back to default
-            try:
-                # Try a common font path
-                font_path = None
-                for path in ["/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 
-                             "/usr/share/fonts/TTF/DejaVuSans.ttf"]:
-                    if os.path.exists(path):
-                        font_path = path
-                        break
-                
-                if font_path:
-                    font = ImageFont.truetype(font_path, 15)
-                else:
-                    font = ImageFont.load_default()
-            except Exception:
+            if font_path:
+                font = ImageFont.truetype(font_path, 15)
+            else:
                 font = ImageFont.load_default()
-            
-            # Draw the text
-            text_to_draw = event_name[:30] + "..." if len(event_name) > 30 else event_name
-            w, h = draw.textsize(text_to_draw, font=font) if hasattr(draw, 'textsize') else (len(text_to_draw) * 7, 15)
-            draw.text(((width - w) / 2, height + 10), text_to_draw, fill="black", font=font)
-            
-            img = new_img
+        except Exception:
+            font = ImageFont.load_default()
         
-        # Save to file
+        # Draw the text
+        text_to_draw = event_name[:30] + "..." if len(event_name) > 30 else event_name
+        w, h = draw.textsize(text_to_draw, font=font) if hasattr(draw, 'textsize') else (len(text_to_draw) * 7, 15)
+        draw.text(((width - w) / 2, height + 10), text_to_draw, fill="black", font=font)
+        
+        img = new_img
+    
+    return img
+
+
+def generate_event_qr(event_id: str, event_name: str = None) -> str:
+    """
+    Generate a QR code for an event and save it to a file.
+    
+    Args:
+        event_id: The ID of the event to encode in the QR code
+        event_name: Optional name to display on the QR code
+    
+    Returns:
+        The path to the saved QR code image
+    """
+    ensure_qr_directory()
+    
+    try:
+        img = _render_event_qr(event_id, event_name)
+        
+        # Save to file; write to a temporary name first so readers never see a partial image
         filename = f"event_{event_id}.png"
         file_path = QR_DIR / filename
-        img.save(file_path)
+        tmp_path = file_path.with_suffix(".png.tmp")
+        img.save(tmp_path, format="PNG")
+        os.replace(tmp_path, file_path)
         
         logger.info(f"Generated QR code for event {event_id} at {file_path}")
         return str(file_path)
@@ -104,13 +137,70 @@ def generate_event_qr(event_id: str, event_name: str = None) -> str:
         return f"https://api.qrserver.com/v1/create-qr-code/?size=200x200&data=event:{event_id}"
 
 
+def generate_event_qr_bytes(event_id: str, event_name: str = None) -> Optional[bytes]:
+    """
+    Generate a QR code for an event as PNG bytes, without writing it to disk.
+    
+    The bytes also seed the in-memory join QR cache, so later join confirmations reuse them.
+    
+    Args:
+        event_id: The ID of the event to encode in the QR code
+        event_name: Optional name to display on the QR code
+    
+    Returns:
+        The PNG image bytes, or None if generation failed
+    """
+    try:
+        buffer = BytesIO()
+        _render_event_qr(event_id, event_name).save(buffer, format="PNG")
+        data = buffer.getvalue()
+    except Exception as e:
+        logger.error(f"Error generating event QR code: {e}")
+        return None
+        
+    _remember_join_qr(event_id, data)
+    
+    logger.info(f"Generated QR code for event {event_id} in memory")
+    return data
+
+
 def generate_join_qr(event_id: str) -> str:
     """
     Generate a QR code specifically for joining an event.
+    
+    The QR code only encodes the event ID, so an existing image for the event is reused.
     """
+    file_path = QR_DIR / f"event_{event_id}.png"
+    if file_path.exists():
+        return str(file_path)
     return generate_event_qr(event_id)
 
 
+def get_join_qr_bytes(event_id: str) -> Optional[bytes]:
+    """
+    Get the PNG bytes of an event's join QR code, kept in memory after the first read.
+    
+    Args:
+        event_id: The event ID
+        
+    Returns:
+        The PNG image bytes, or None if the QR code could not be generated
+    """
+    with _JOIN_QR_LOCK:
+        data = _JOIN_QR_BYTES.get(event_id)
+        if data is not None:
+            _JOIN_QR_BYTES.move_to_end(event_id)
+            return data
+            
+    file_path = Path(generate_join_qr(event_id))
+    if not file_path.is_file():
+        return None
+    data = file_path.read_bytes()
+    
+    _remember_join_qr(event_id, data)
+    return data
+
+
 def generate_wallet_qr(wallet_address: str) -> str:
     """
     Generate a QR code for a wallet address and save it to a file.
@@ -153,6 +243,24 @@ def generate_wallet_qr(wallet_address: str) -> str:
         return f"https://api.qrserver.com/v1/create-qr-code/?size=200x200&data=solana:{wallet_address}"
 
 
+def get_wallet_qr_bytes(wallet_address: str) -> Optional[bytes]:
+    """
+    Get the PNG bytes of a wallet's QR code, reusing the saved image if there is one.
+    
+    Args:
+        wallet_address: The wallet address
+        
+    Returns:
+        The PNG image bytes, or None if the QR code could not be generated
+    """
+    file_path = QR_DIR / f"wallet_{wallet_address[:8]}.png"
+    if not file_path.is_file():
+        file_path = Path(generate_wallet_qr(wallet_address))
+        if not file_path.is_file():
+            return None
+    return file_path.read_bytes()
+
+
 def generate_qr_svg(data: str) -> Optional[str]:
     """
     Generate a QR code as an SVG string.
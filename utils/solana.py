@@ -15,6 +15,7 @@ from pathlib import Path
 
 import base58
 import requests
+from requests.adapters import HTTPAdapter
 
 # Since anchorpy might have compatibility issues, we'll create simplified versions
 # of Provider and Program classes for our use case
@@ -89,8 +90,7 @@ class Program:
                 # In real implementation with anchorpy, this would be handled automatically
                 # by the library, but we're simulating it here
                 try:
-                    response = requests.post(PRIMARY_RPC_URL, json=rpc_payload, timeout=10)
-                    response_data = response.json()
+                    response_data = await _rpc_post(PRIMARY_RPC_URL, rpc_payload)
                     
                     if "result" in response_data:
                         tx_signature = response_data["result"]
@@ -116,9 +116,28 @@ SOLANA_DEVNET_URL = "https://api.devnet.solana.com"  # Fallback
 # Use Helius as primary RPC endpoint for higher reliability
 PRIMARY_RPC_URL = HELIUS_DEVNET_URL
 
+# Shared HTTP session for all RPC calls, so requests reuse pooled keep-alive
+# connections instead of paying a TCP and TLS handshake each time
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
 # Program ID for SolMeet on Devnet
 PROGRAM_ID = os.getenv("SOLMEET_PROGRAM_ID", "Gx3muwmBzRr8DVvyPdW46PNbT815TGcVqSf7q1WUeHwj")
 
+async def _rpc_post(url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Send a JSON-RPC request without blocking the event loop.
+    
+    Args:
+        url: The RPC endpoint
+        payload: The JSON-RPC request body
+        
+    Returns:
+        The decoded JSON response
+    """
+    response = await asyncio.to_thread(_http.post, url, json=payload, timeout=10)
+    return response.json()
+
 # Initialize globals
 _program = None
 _provider = None
@@ -204,15 +223,13 @@ async def get_sol_balance(wallet_address: str) -> float:
         
         # First try Helius RPC endpoint
         logger.info(f"Querying Helius RPC for balance of {wallet_address}")
-        response = requests.post(PRIMARY_RPC_URL, json=payload, timeout=10)
-        data = response.json()
+        data = await _rpc_post(PRIMARY_RPC_URL, payload)
         
         if "error" in data:
             logger.error(f"Helius RPC error: {data['error']}")
             # Try fallback to standard Solana Devnet
             logger.info(f"Falling back to Solana Devnet for balance query")
-            response = requests.post(SOLANA_DEVNET_URL, json=payload, timeout=10)
-            data = response.json()
+            data = await _rpc_post(SOLANA_DEVNET_URL, payload)
             
             if "error" in data:
                 logger.error(f"Solana Devnet RPC error too: {data['error']}")
@@ -251,8 +268,7 @@ async def request_airdrop(wallet_address: str, amount_sol: float) -> str:
         # First try with Helius RPC for reliable airdrop
         logger.info(f"Requesting airdrop via Helius RPC for {wallet_address}")
         try:
-            response = requests.post(PRIMARY_RPC_URL, json=payload, timeout=10)
-            data = response.json()
+            data = await _rpc_post(PRIMARY_RPC_URL, payload)
             
             if "error" not in data:
                 # Get the transaction signature
@@ -265,8 +281,7 @@ async def request_airdrop(wallet_address: str, amount_sol: float) -> str:
             logger.warning(f"Helius airdrop request failed: {he}. Falling back to Solana Devnet...")
         
         # If Helius fails, fall back to standard Solana Devnet
-        response = requests.post(SOLANA_DEVNET_URL, json=payload, timeout=10)
-        data = response.json()
+        data = await _rpc_post(SOLANA_DEVNET_URL, payload)
         
         if "error" in data:
             error_msg = data["error"]["message"]
@@ -348,6 +363,27 @@ async def create_event_onchain(
     
     logger.info(f"Creating event {event_id} on-chain with creator {creator_wallet}")
     
+    # Save event metadata in a local file before touching the chain, so the event can be
+    # joined even if the caller gives up on the transaction; the result is filled in below
+    from datetime import datetime
+    event_data = {
+        "id": event_id,
+        "name": name,
+        "description": description,
+        "venue": venue,
+        "date": date_str,
+        "max_claims": max_claims,
+        "creator": creator_wallet,
+        "creator_id": creator_id,  # Store creator's Telegram user ID for notifications
+        "claims": [],
+        "created_at": int(datetime.now().timestamp()),
+        "tx_signature": None,
+        "is_onchain": False  # Mark whether it was successfully stored on-chain
+    }
+    event_path = os.path.join(events_dir, f"{event_id}.json")
+    with open(event_path, "w") as f:
+        json.dump(event_data, f, indent=2)
+    
     # Build event data for on-chain storage
     event_json = json.dumps({
         "id": event_id,
@@ -412,8 +448,7 @@ async def create_event_onchain(
                 
                 # First get a recent blockhash
                 logger.info("Getting recent blockhash for memo transaction...")
-                blockhash_response = requests.post(PRIMARY_RPC_URL, json=memo_tx_payload, timeout=10)
-                blockhash_data = blockhash_response.json()
+                blockhash_data = await _rpc_post(PRIMARY_RPC_URL, memo_tx_payload)
                 
                 if "result" in blockhash_data and blockhash_data["result"]:
                     recent_blockhash = blockhash_data["result"]["value"]["blockhash"]
@@ -497,8 +532,7 @@ async def create_event_onchain(
                 
                 # Send the memo transaction
                 logger.info("Sending memo transaction to Helius...")
-                response = requests.post(PRIMARY_RPC_URL, json=memo_payload, timeout=10)
-                data = response.json()
+                data = await _rpc_post(PRIMARY_RPC_URL, memo_payload)
                 
                 if "result" in data:
                     tx_signature = data["result"]
@@ -515,24 +549,16 @@ async def create_event_onchain(
         logger.error(f"Error creating event on-chain: {e}")
         tx_signature = f"error_tx_createEvent_{random.randint(10000, 99999)}"
     
-    # Save event metadata in a local file for compatibility regardless of transaction success
-    from datetime import datetime
-    event_data = {
-        "id": event_id,
-        "name": name,
-        "description": description,
-        "venue": venue,
-        "date": date_str if 'date_str' in locals() else date,
-        "max_claims": max_claims,
-        "creator": creator_wallet,
-        "creator_id": creator_id,  # Store creator's Telegram user ID for notifications
-        "claims": [],
-        "created_at": int(datetime.now().timestamp()),
-        "tx_signature": tx_signature,
-        "is_onchain": is_onchain  # Mark whether it was successfully stored on-chain
-    }
-    
-    with open(os.path.join(events_dir, f"{event_id}.json"), "w") as f:
+    # Record the transaction result in the local event file, re-read in case a join
+    # updated it while the transaction was in flight
+    try:
+        with open(event_path, "r") as f:
+            event_data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not re-read event file {event_path}: {e}")
+    event_data["tx_signature"] = tx_signature
+    event_data["is_onchain"] = is_onchain
+    with open(event_path, "w") as f:
         json.dump(event_data, f, indent=2)
     
     logger.info(f"Created event {event_id} with tx: {tx_signature}, on-chain: {is_onchain}")
@@ -626,8 +652,7 @@ async def join_event_onchain(
                 
                 # First get a recent blockhash
                 logger.info("Getting recent blockhash for join memo transaction...")
-                blockhash_response = requests.post(PRIMARY_RPC_URL, json=memo_tx_payload, timeout=10)
-                blockhash_data = blockhash_response.json()
+                blockhash_data = await _rpc_post(PRIMARY_RPC_URL, memo_tx_payload)
                 
                 if "result" in blockhash_data and blockhash_data["result"]:
                     recent_blockhash = blockhash_data["result"]["value"]["blockhash"]
@@ -711,8 +736,7 @@ async def join_event_onchain(
                 
                 # Send the memo transaction
                 logger.info("Sending join memo transaction to Helius...")
-                response = requests.post(PRIMARY_RPC_URL, json=memo_payload, timeout=10)
-                data = response.json()
+                data = await _rpc_post(PRIMARY_RPC_URL, memo_payload)
                 
                 if "result" in data:
                     tx_signature = data["result"]
@@ -763,6 +787,33 @@ async def join_event_onchain(
     return tx_signature
 
 
+def _read_event_files(events_dir: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Read and parse every event file, skipping any that can't be read.
+    
+    Args:
+        events_dir: The directory holding the event JSON files
+        
+    Returns:
+        A list of (filename, event data) pairs
+    """
+    if not os.path.exists(events_dir):
+        os.makedirs(events_dir, exist_ok=True)
+        logger.info(f"Created events directory at {events_dir}")
+        return []
+        
+    event_files = []
+    for filename in os.listdir(events_dir):
+        if not filename.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(events_dir, filename), "r") as f:
+                event_files.append((filename, json.load(f)))
+        except Exception as e:
+            logger.error(f"Error reading event file {filename}: {e}")
+    return event_files
+
+
 async def get_user_events(wallet_address: str) -> Dict[str, List[Dict[str, Any]]]:
     """
     Get events created or joined by a user.
@@ -782,26 +833,16 @@ async def get_user_events(wallet_address: str) -> Dict[str, List[Dict[str, Any]]
         created_events = []
         joined_events = []
         
-        # Check our events directory for files
-        events_dir = os.path.join(".", "events")
-        if not os.path.exists(events_dir):
-            os.makedirs(events_dir, exist_ok=True)
-            logger.info(f"Created events directory at {events_dir}")
-            return {"created": [], "joined": []}
-            
-        # Get all event files
-        event_files = [f for f in os.listdir(events_dir) if f.endswith(".json")]
+        # Read every event file in one worker thread instead of on the event loop
+        event_files = await asyncio.to_thread(_read_event_files, os.path.join(".", "events"))
         
         if not event_files:
             # No events found, return empty lists
             return {"created": [], "joined": []}
             
         # Process each event file
-        for filename in event_files:
+        for filename, event_data in event_files:
             try:
-                with open(os.path.join(events_dir, filename), "r") as f:
-                    event_data = json.load(f)
-                    
                 # Check if this wallet created the event
                 if event_data.get("creator") == wallet_address:
                     # Format created event
@@ -919,6 +960,4 @@ async def get_user_events(wallet_address: str) -> Dict[str, List[Dict[str, Any]]
 
 def format_wallet_address(address: str) -> str:
     """Format a wallet address for display by truncating the middle."""
-    if len(address) <= 12:
-        return address
-    return f"{address[:6]}...{address[-4:]}"
+    return f"{address[:6]}...{address[-4:]}" if len(address) > 12 else address
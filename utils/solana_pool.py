@@ -0,0 +1,37 @@
+"""
+Bounded submission of on-chain join transactions for the SolMeet bot.
+Keeps bursts of approvals from flooding the Solana RPC endpoint.
+"""
+
+import asyncio
+import logging
+import os
+
+from utils.solana import join_event_onchain
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of join transactions in flight at once
+MAX_CONCURRENT_JOINS = int(os.getenv("SOLANA_MAX_CONCURRENT_JOINS", "4"))
+
+# Timeout for a single join transaction, in seconds (not counting time spent waiting for a slot)
+JOIN_TIMEOUT = 10.0
+
+_join_slots = asyncio.Semaphore(MAX_CONCURRENT_JOINS)
+
+async def submit_join(wallet_address: str, event_id: str) -> str:
+    """
+    Join an event on-chain once one of the MAX_CONCURRENT_JOINS slots is free.
+
+    Args:
+        wallet_address: The attendee's wallet address
+        event_id: The event ID
+
+    Returns:
+        The transaction signature
+
+    Raises:
+        asyncio.TimeoutError: If the transaction took longer than JOIN_TIMEOUT
+    """
+    async with _join_slots:
+        return await asyncio.wait_for(join_event_onchain(wallet_address, event_id), timeout=JOIN_TIMEOUT)